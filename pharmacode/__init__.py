@@ -0,0 +1,3 @@
+"""
+Pre-Pharmacode V2.5 - shared building blocks for the drug information apps.
+"""
@@ -0,0 +1,65 @@
+"""
+Google Analytics bootstrap, injected once per browser session.
+
+The tracker (``pharmacode/scripts/analytics.js``) is published as a
+fingerprinted static file and added to the app page's ``<head>`` by a tiny
+component iframe. Because the tracker lives in the page rather than in the
+iframe, the iframe only has to be rendered on a session's first script run
+(and again when the session switches to another drug's app name).
+"""
+
+import json
+import os
+from dataclasses import dataclass
+
+from pharmacode.assets import content_digest, write_fingerprinted
+
+TRACKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "analytics.js")
+SCRIPT_ID = "pharmacode-analytics"
+
+
+@dataclass(frozen=True, slots=True)
+class Tracker:
+    text: str
+    digest: str
+    filename: str | None  # None when the script has to be inlined
+
+
+def build_tracker(src=TRACKER, out_dir=None):
+    with open(src, encoding="utf-8") as f:
+        text = f.read()
+    data = text.encode("utf-8")
+    filename = write_fingerprinted(data, out_dir, "analytics", "js") if out_dir is not None else None
+    return Tracker(text, content_digest(data), filename)
+
+
+def _js(value):
+    return json.dumps(value).replace("</", "<\\/")
+
+
+def bootstrap_html(tracker, url_prefix, ga_id, app_name, sample_rate=1.0, flush_interval_ms=10000):
+    """Component HTML that adds the tracker to the parent page, or only sets its ``app_name`` if it is there.
+
+    ``sample_rate`` is the share of browser sessions that are tracked at all;
+    queued events are sent every ``flush_interval_ms`` and whenever the page is hidden.
+    """
+    if tracker.filename:
+        load = f"script.src = {_js(url_prefix + tracker.filename)};"
+    else:
+        load = f"script.text = {_js(tracker.text)};"
+    return f"""<script>
+    const parentDoc = window.parent.document;
+    const existing = parentDoc.getElementById({_js(SCRIPT_ID)});
+    if (existing) {{
+        existing.dataset.appName = {_js(app_name)};
+    }} else {{
+        var script = parentDoc.createElement('script');
+        script.id = {_js(SCRIPT_ID)};
+        script.dataset.gaId = {_js(ga_id)};
+        script.dataset.appName = {_js(app_name)};
+        script.dataset.sampleRate = {_js(str(sample_rate))};
+        script.dataset.flushInterval = {_js(str(flush_interval_ms))};
+        {load}
+        parentDoc.head.appendChild(script);
+    }}
+</script>"""
@@ -0,0 +1,458 @@
+"""
+Deploy-time content artifact shared by every worker of a host.
+
+    python -m pharmacode.artifact build [--drug entresto | --all] [-o DIR]
+    python -m pharmacode.artifact info [--drug entresto]
+
+``build`` renders a monograph once into ``pharmacode/artifacts/<drug>.pcart``.
+The file holds:
+- the prepared tab fragments;
+- the search index;
+- the metadata of the optimized image variants, which it encodes into
+  ``static/img`` on the way.
+
+Workers open it with ``open_artifact`` and map it read-only. They then skip
+the template rendering, the index build and Pillow, and all the replicas
+of a host share one copy of the file in the page cache.
+
+The search index is the bulk of a worker's content memory (several MB, most
+of it typo-tolerance variants). It is stored as sorted string tables and
+flat u32 arrays. ``MappedSearchIndex`` answers the same queries as
+``search.SearchIndex`` by binary search over them, in place: a query only
+decodes the few strings it touches. Tab fragments are small and are
+decoded once per process.
+
+An artifact records the content hash of the monograph it was built from,
+and a digest of the code that rendered it. A worker ignores an artifact
+that does not match both and builds the content itself, as without one.
+Arrays are in native byte order: build on the platform that serves.
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+
+from pharmacode.assets import content_digest, resolve_asset
+from pharmacode.images import ImageSet, Variant, build_variants, source_digest
+from pharmacode.model import available_drugs, load_monograph, monograph_path
+from pharmacode.render import Callout, Columns, Divider, Expander, Header, Html, Markdown, Tab, Widget, prepare_tabs
+from pharmacode.search import SearchIndex, Section, build_index
+from pharmacode.templates import build_tab
+from pharmacode.versioning import combined_hash, load_section_hashes
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(PACKAGE_DIR)
+ARTIFACT_DIR = os.path.join(PACKAGE_DIR, "artifacts")
+IMAGE_DIR = os.path.join(APP_DIR, "static", "img")  # served at app/static/img/, as by the app
+MAGIC = b"PCART\x00\x00\x01"  # the last byte is the format version
+_PREAMBLE = struct.Struct("<8sQ")  # magic, header length
+# Modules whose output an artifact stores: a change to any of them invalidates it
+SOURCES = ("artifact.py", "images.py", "model.py", "render.py", "search.py", "templates.py")
+assert array("I").itemsize == 4
+
+
+def artifact_path(drug):
+    return os.path.join(ARTIFACT_DIR, f"{drug}.pcart")
+
+
+def content_version(hashes):
+    """One hash over every section of a monograph (``versioning.section_hashes``)."""
+    return combined_hash(hashes, *sorted(hashes))
+
+
+def code_version(sources=SOURCES):
+    parts = []
+    for name in sources:
+        with open(os.path.join(PACKAGE_DIR, name), "rb") as f:
+            parts.append(f.read())
+    return content_digest(b"\0".join(parts))
+
+
+# ==================== WRITING ====================
+class _Strings:
+    """UTF-8 text blob; ``ref`` returns ``[offset, length]`` and stores each distinct text once."""
+
+    def __init__(self):
+        self.blob = bytearray()
+        self._refs = {}
+
+    def ref(self, text):
+        if text not in self._refs:
+            data = text.encode("utf-8")
+            self._refs[text] = [len(self.blob), len(data)]
+            self.blob += data
+        return self._refs[text]
+
+
+def _string_table(strings):
+    """Blob and ``len + 1`` u32 offsets of ``strings`` (already sorted)."""
+    blob, offsets = bytearray(), array("I", [0])
+    for text in strings:
+        blob += text.encode("utf-8")
+        offsets.append(len(blob))
+    return bytes(blob), offsets.tobytes()
+
+
+def _encode_blocks(blocks, strings):
+    encoded = []
+    for block in blocks:
+        if isinstance(block, Html):
+            encoded.append(["html", strings.ref(block.text)])
+        elif isinstance(block, Markdown):
+            encoded.append(["markdown", strings.ref(block.text)])
+        elif isinstance(block, Header):
+            encoded.append(["header", strings.ref(block.text)])
+        elif isinstance(block, Callout):
+            encoded.append(["callout", block.kind, strings.ref(block.text)])
+        elif isinstance(block, Divider):
+            encoded.append(["divider"])
+        elif isinstance(block, Expander):
+            encoded.append(["expander", block.label, _encode_blocks(block.blocks, strings)])
+        elif isinstance(block, Columns):
+            encoded.append(["columns", [_encode_blocks(column, strings) for column in block.columns]])
+        elif isinstance(block, Widget):
+            encoded.append(["widget", block.name])
+        else:
+            raise TypeError(f"cannot store block {block!r}")
+    return encoded
+
+
+def _search_parts(index, strings):
+    """Header records and binary parts of a built ``SearchIndex``."""
+    vocabulary = index.vocabulary
+    term_ids = {term: i for i, term in enumerate(vocabulary)}
+    offsets, docs, tfs = array("I", [0]), array("I"), array("I")
+    for term in vocabulary:
+        for doc, tf in sorted(index.postings[term].items()):
+            docs.append(doc)
+            tfs.append(tf)
+        offsets.append(len(docs))
+    variants = index.deletions.variants
+    variant_names = sorted(variants)
+    variant_offsets, variant_terms = array("I", [0]), array("I")
+    for variant in variant_names:
+        variant_terms.extend(sorted(term_ids[term] for term in variants[variant]))
+        variant_offsets.append(len(variant_terms))
+    vocabulary_blob, vocabulary_offsets = _string_table(vocabulary)
+    variant_blob, variant_name_offsets = _string_table(variant_names)
+    records = [
+        [s.tab_key, s.tab_label, list(s.path), s.title, strings.ref(s.text), strings.ref(s.html) if s.html else None]
+        for s in index.sections
+    ]
+    parts = {
+        "vocabulary": vocabulary_blob,
+        "vocabulary_offsets": vocabulary_offsets,
+        "postings_offsets": offsets.tobytes(),
+        "postings_docs": docs.tobytes(),
+        "postings_tfs": tfs.tobytes(),
+        "variants": variant_blob,
+        "variants_offsets": variant_name_offsets,
+        "variant_terms_offsets": variant_offsets.tobytes(),
+        "variant_terms": variant_terms.tobytes(),
+    }
+    return records, parts
+
+
+def _image_entry(image_set):
+    return {
+        "digest": image_set.digest,
+        "width": image_set.width,
+        "height": image_set.height,
+        "variants": [[v.width, v.format, v.mime, v.filename, v.size] for v in image_set.variants],
+        "fallback": [image_set.fallback.width, image_set.fallback.format, image_set.fallback.mime,
+                     image_set.fallback.filename, image_set.fallback.size],
+    }
+
+
+def write_artifact(out_path, header, parts):
+    """``MAGIC``, header length, JSON header, then the 8-byte aligned parts; replaced atomically."""
+    layout, offset = {}, 0
+    for name, data in parts.items():
+        layout[name] = [offset, len(data)]
+        offset += -(-len(data) // 8) * 8
+    header = dict(header, parts=layout)
+    encoded = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp = f"{out_path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, len(encoded)))
+        f.write(encoded)
+        f.write(b"\0" * (-f.tell() % 8))
+        for data in parts.values():
+            f.write(data)
+            f.write(b"\0" * (-len(data) % 8))
+    # Running workers keep the old file's mapping; new ones open this one
+    os.replace(tmp, out_path)
+    return out_path
+
+
+def build_artifact(drug, out_path=None, image_dir=IMAGE_DIR):
+    """Render ``drug``'s monograph into an artifact; returns its path."""
+    path = monograph_path(drug)
+    monograph = load_monograph(path)
+    tabs = prepare_tabs(tuple(build_tab(monograph, spec) for spec in monograph.tabs))
+    strings = _Strings()
+    encoded_tabs = [[tab.key, tab.label, _encode_blocks(tab.blocks, strings)] for tab in tabs]
+    records, parts = _search_parts(build_index(tabs), strings)
+    images = {}
+    image_path = resolve_asset(monograph.drug.image, APP_DIR, os.path.dirname(APP_DIR))
+    if image_path:
+        images[os.path.basename(image_path)] = _image_entry(build_variants(image_path, image_dir))
+    header = {
+        "drug": drug,
+        "content": content_version(load_section_hashes(path)),
+        "code": code_version(),
+        "tabs": encoded_tabs,
+        "search": {"sections": records},
+        "images": images,
+    }
+    parts["strings"] = bytes(strings.blob)
+    return write_artifact(out_path or artifact_path(drug), header, parts)
+
+
+# ==================== READING ====================
+class StringTable(Sequence):
+    """Sorted strings read from a blob and u32 offsets in place; bisectable, decoding only what is compared."""
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+    def find(self, text):
+        """Position of ``text``, -1 when absent."""
+        i = bisect_left(self, text)
+        return i if i < len(self) and self[i] == text else -1
+
+
+class _Postings(Mapping):
+    """term -> {section id: term frequency}, one term's slice of the arrays at a time."""
+
+    def __init__(self, vocabulary, offsets, docs, tfs):
+        self._vocabulary = vocabulary
+        self._offsets = offsets
+        self._docs = docs
+        self._tfs = tfs
+
+    def _range(self, term):
+        i = self._vocabulary.find(term)
+        if i < 0:
+            raise KeyError(term)
+        return self._offsets[i], self._offsets[i + 1]
+
+    def __getitem__(self, term):
+        start, end = self._range(term)
+        return dict(zip(self._docs[start:end], self._tfs[start:end]))
+
+    def __contains__(self, term):
+        return self._vocabulary.find(term) >= 0
+
+    def __iter__(self):
+        return iter(self._vocabulary)
+
+    def __len__(self):
+        return len(self._vocabulary)
+
+    def document_frequency(self, term):
+        start, end = self._range(term)
+        return end - start
+
+
+class _Idf(Mapping):
+    def __init__(self, postings, sections):
+        self._postings = postings
+        self._sections = sections
+
+    def __getitem__(self, term):
+        return math.log(1 + self._sections / self._postings.document_frequency(term))
+
+    def __iter__(self):
+        return iter(self._postings)
+
+    def __len__(self):
+        return len(self._postings)
+
+
+class _Deletions:
+    """Deletion variant -> terms, as ``search.DeletionIndex.get``."""
+
+    def __init__(self, variants, offsets, terms, vocabulary):
+        self._variants = variants
+        self._offsets = offsets
+        self._terms = terms
+        self._vocabulary = vocabulary
+
+    def get(self, variant):
+        i = self._variants.find(variant)
+        if i < 0:
+            return ()
+        return tuple(self._vocabulary[t] for t in self._terms[self._offsets[i]:self._offsets[i + 1]])
+
+
+class _Sections(Sequence):
+    """``search.Section``s decoded on access: a query only materializes its hits."""
+
+    def __init__(self, records, string):
+        self._records = records
+        self._string = string
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, i):
+        tab_key, tab_label, path, title, text, fragment = self._records[i]
+        return Section(i, tab_key, tab_label, tuple(path), title, self._string(text),
+                       self._string(fragment) if fragment else None)
+
+
+class MappedSearchIndex(SearchIndex):
+    """``SearchIndex`` whose postings, vocabulary and typo index are the artifact's arrays, read in place."""
+
+    def __init__(self, artifact):
+        part = artifact.part
+        self.sections = _Sections(artifact.header["search"]["sections"], artifact.string)
+        self.vocabulary = StringTable(part("vocabulary"), part("vocabulary_offsets", "I"))
+        self.postings = _Postings(self.vocabulary, part("postings_offsets", "I"), part("postings_docs", "I"),
+                                  part("postings_tfs", "I"))
+        self.idf = _Idf(self.postings, len(self.sections))
+        self.deletions = _Deletions(StringTable(part("variants"), part("variants_offsets", "I")),
+                                    part("variant_terms_offsets", "I"), part("variant_terms", "I"), self.vocabulary)
+
+
+def _decode_blocks(encoded, string):
+    blocks = []
+    for kind, *fields in encoded:
+        if kind == "html":
+            blocks.append(Html(string(fields[0])))
+        elif kind == "markdown":
+            blocks.append(Markdown(string(fields[0])))
+        elif kind == "header":
+            blocks.append(Header(string(fields[0])))
+        elif kind == "callout":
+            blocks.append(Callout(fields[0], string(fields[1])))
+        elif kind == "divider":
+            blocks.append(Divider())
+        elif kind == "expander":
+            blocks.append(Expander(fields[0], _decode_blocks(fields[1], string)))
+        elif kind == "columns":
+            blocks.append(Columns(tuple(_decode_blocks(column, string) for column in fields[0])))
+        elif kind == "widget":
+            blocks.append(Widget(fields[0]))
+        else:
+            raise ValueError(f"unknown block kind {kind!r}")
+    return tuple(blocks)
+
+
+class Artifact:
+    """A built artifact, mapped read-only: the OS shares its pages between every process mapping it."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = _PREAMBLE.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a pharmacode artifact of format {MAGIC[-1]}")
+        self.header = json.loads(self._map[_PREAMBLE.size:_PREAMBLE.size + header_length])
+        self._data = _PREAMBLE.size + header_length + (-(_PREAMBLE.size + header_length) % 8)
+        self._view = memoryview(self._map)
+        self._strings = self.part("strings")
+
+    @property
+    def content(self):
+        return self.header["content"]
+
+    @property
+    def code(self):
+        return self.header["code"]
+
+    def part(self, name, typecode=None):
+        """Zero-copy view of a binary part; cast to ``typecode`` (``"I"``: u32) if given."""
+        offset, length = self.header["parts"][name]
+        view = self._view[self._data + offset:self._data + offset + length]
+        return view.cast(typecode) if typecode else view
+
+    def string(self, ref):
+        offset, length = ref
+        return str(self._strings[offset:offset + length], "utf-8")
+
+    def tabs(self):
+        """The prepared tabs, as ``render.prepare_tabs`` returns them."""
+        return tuple(Tab(key, label, _decode_blocks(blocks, self.string)) for key, label, blocks in self.header["tabs"])
+
+    def search_index(self):
+        return MappedSearchIndex(self)
+
+    def image_set(self, path, out_dir=IMAGE_DIR):
+        """The variants of image ``path`` built with the artifact; None if it has changed or they are missing."""
+        entry = self.header["images"].get(os.path.basename(path))
+        if entry is None or source_digest(path) != entry["digest"]:
+            return None
+        variants = tuple(Variant(*fields) for fields in entry["variants"])
+        fallback = Variant(*entry["fallback"])
+        if not all(os.path.exists(os.path.join(out_dir, v.filename)) for v in variants + (fallback,)):
+            return None
+        return ImageSet(path, entry["digest"], entry["width"], entry["height"], variants, fallback)
+
+
+def open_artifact(path, section_hashes):
+    """The artifact at ``path`` if it was built from this content (``section_hashes``) and code, else None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        artifact = Artifact(path)
+    except (OSError, ValueError):
+        return None
+    if artifact.content != content_version(section_hashes) or artifact.code != code_version():
+        return None
+    return artifact
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the deploy-time content artifacts.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="render monographs into artifacts")
+    build.add_argument("--drug", default="entresto", help="monograph key (pharmacode/monographs/<key>.json)")
+    build.add_argument("--all", action="store_true", help="every monograph in pharmacode/monographs")
+    build.add_argument("-o", "--out", help=f"output directory (default: {os.path.relpath(ARTIFACT_DIR, APP_DIR)})")
+    info = commands.add_parser("info", help="show an artifact's versions and part sizes")
+    info.add_argument("--drug", default="entresto")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        for drug in available_drugs() if args.all else (args.drug,):
+            out_path = os.path.join(args.out, f"{drug}.pcart") if args.out else None
+            path = build_artifact(drug, out_path)
+            print(f"{path}\t{os.path.getsize(path)} bytes")
+    else:
+        path = artifact_path(args.drug)
+        if not os.path.exists(path):
+            parser.error(f"no artifact at {path}; run: python -m pharmacode.artifact build --drug {args.drug}")
+        artifact = Artifact(path)
+        current = open_artifact(path, load_section_hashes(monograph_path(args.drug))) is not None
+        out = sys.stdout
+        out.write(f"{path}\ncontent {artifact.content}  code {artifact.code}  {'current' if current else 'STALE'}\n")
+        for name, (_, length) in artifact.header["parts"].items():
+            out.write(f"  {name:<24}{length:>9} bytes\n")
+
+
+if __name__ == "__main__":
+    main()
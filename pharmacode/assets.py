@@ -0,0 +1,137 @@
+"""
+Process-wide asset lookup and a bounded, mtime-checked bytes cache.
+
+Script reruns ask for the same few files over and over; ``resolve_asset``
+remembers where each one was found and ``AssetCache`` keeps their bytes,
+only re-checking the file's mtime once ``revalidate_after`` seconds have
+passed, so a typical rerun touches the filesystem not at all.
+``write_fingerprinted`` publishes generated files (CSS, JS) under
+content-hashed names for static serving.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+_resolved = {}
+_resolved_lock = threading.Lock()
+
+
+def resolve_asset(name, *search_dirs):
+    """First existing ``name`` under ``search_dirs``, remembered per process.
+
+    Misses are not remembered, so a file added later is still picked up.
+    """
+    key = (name, search_dirs)
+    path = _resolved.get(key)
+    if path is None:
+        path = next(
+            (candidate for candidate in (os.path.join(d, name) for d in search_dirs) if os.path.exists(candidate)),
+            None,
+        )
+        if path is not None:
+            with _resolved_lock:
+                _resolved[key] = path
+    return path
+
+
+def forget_asset(path):
+    """Drop ``path`` from the lookups ``resolve_asset`` remembered, so the next call searches again."""
+    with _resolved_lock:
+        for key in [key for key, resolved in _resolved.items() if resolved == path]:
+            del _resolved[key]
+
+
+@dataclass(frozen=True, slots=True)
+class Asset:
+    path: str
+    mtime_ns: int
+    data: bytes
+
+
+class AssetCache:
+    """LRU of file contents bounded by entry count, invalidated by mtime."""
+
+    def __init__(self, maxsize=8, revalidate_after=30.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.revalidate_after = revalidate_after
+        self._clock = clock
+        self._entries = OrderedDict()  # path -> (asset, checked_at)
+        self._mtimes = {}  # path -> (mtime_ns, checked_at), for files only watched for changes
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """``path``'s bytes; None once it is gone (removed or renamed), which also forgets its lookup."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and now - entry[1] < self.revalidate_after:
+                self._entries.move_to_end(path)
+                return entry[0]
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            if entry is not None and entry[0].mtime_ns == mtime_ns:
+                asset = entry[0]
+            else:
+                with open(path, "rb") as f:
+                    asset = Asset(path, mtime_ns, f.read())
+        except OSError:
+            self._forget(path)
+            return None
+        with self._lock:
+            self._entries[path] = (asset, now)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return asset
+
+    def mtime_ns(self, path):
+        """``path``'s mtime, re-checked at most every ``revalidate_after`` seconds; no bytes are read or kept.
+
+        None once the file is gone, as for ``get``.
+        """
+        now = self._clock()
+        entry = self._mtimes.get(path)
+        if entry is None or now - entry[1] >= self.revalidate_after:
+            try:
+                entry = (os.stat(path).st_mtime_ns, now)
+            except OSError:
+                self._forget(path)
+                return None
+            with self._lock:
+                self._mtimes[path] = entry
+        return entry[0]
+
+    def _forget(self, path):
+        with self._lock:
+            self._entries.pop(path, None)
+            self._mtimes.pop(path, None)
+        forget_asset(path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._mtimes.clear()
+
+
+ASSETS = AssetCache()
+
+
+def content_digest(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def write_fingerprinted(data, out_dir, stem, ext):
+    """Write ``data`` once as ``<stem>.<digest>.<ext>`` in ``out_dir``; return the file name."""
+    name = f"{stem}.{content_digest(data)}.{ext}"
+    path = os.path.join(out_dir, name)
+    if not os.path.exists(path):
+        os.makedirs(out_dir, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return name
@@ -0,0 +1,340 @@
+"""
+Script-run benchmark for the drug apps, built on Streamlit's ``AppTest``.
+
+    python -m pharmacode.bench [--runs 10] [--sessions 20] [--json out.json] [--baseline old.json]
+
+Measures, in one process:
+
+* cold run latency (process caches cleared) and warm rerun latency,
+  plus a new session's first run against warm caches;
+* the bytes of the forward messages (deltas) each run sends to the browser;
+* RSS and Python heap growth per open session (RSS is allocator-noisy at
+  this size; the traced heap is the figure to watch), also without the
+  allocations of ``AppTest`` itself (its element tree), which a server
+  does not have;
+* with ``--tabs``, the bytes, elements and heap per session with each tab
+  open;
+* the same latency/bytes with the analytics, CSS and image blocks skipped
+  one at a time (``PHARMACODE_SKIP``), giving each block's cost. Blocks
+  served from process caches cost little, so expect their latency deltas
+  to sit near the noise floor; the byte deltas are exact.
+
+``--low-memory`` measures the app's low-memory mode (``PHARMACODE_LOW_MEMORY``).
+``--baseline`` compares against an earlier ``--json`` file and exits
+non-zero when a metric regressed by more than ``--tolerance``.
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+import streamlit as st
+from streamlit import config, logger
+from streamlit.testing.v1 import AppTest, app_test
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+from pharmacode.assets import ASSETS
+from pharmacode.model import load_monograph, monograph_path
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Entresto_app.py")
+BLOCKS = ("analytics", "css", "image")
+# Lower is better for every metric; these are compared against a baseline
+TRACKED = (
+    "cold_ms", "warm_ms", "session_ms", "first_run_bytes", "rerun_bytes", "heap_per_session_kb", "app_heap_per_session_kb",
+)
+# Allocations made by the test harness rather than the app or the Streamlit runtime: AppTest's element tree,
+# and the component manifest scan each AppTest starts (it interns every installed package's file names)
+HARNESS = (
+    tracemalloc.Filter(False, "*/streamlit/testing/*"),
+    tracemalloc.Filter(False, "*/streamlit/components/v2/manifest_scanner.py", all_frames=True),
+)
+TRACE_FRAMES = 32  # deep enough to see the manifest scan below pathlib
+
+
+# ==================== PROBES ====================
+class _RecordingRunner(LocalScriptRunner):
+    """Script runner that remembers the size of the messages of its last run."""
+
+    last_bytes = 0
+    last_elements = 0
+
+    def run(self, *args, **kwargs):
+        tree = super().run(*args, **kwargs)
+        msgs = self.forward_msgs()
+        _RecordingRunner.last_bytes = sum(msg.ByteSize() for msg in msgs)
+        _RecordingRunner.last_elements = sum(msg.WhichOneof("type") == "delta" for msg in msgs)
+        return tree
+
+
+@contextlib.contextmanager
+def recording():
+    original = app_test.LocalScriptRunner
+    app_test.LocalScriptRunner = _RecordingRunner
+    try:
+        yield
+    finally:
+        app_test.LocalScriptRunner = original
+
+
+@contextlib.contextmanager
+def _env(name, value):
+    previous = os.environ.get(name)
+    os.environ[name] = value
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop(name)
+        else:
+            os.environ[name] = previous
+
+
+def skipping(blocks):
+    return _env("PHARMACODE_SKIP", ",".join(blocks))
+
+
+def low_memory(enabled=True):
+    return _env("PHARMACODE_LOW_MEMORY", "1" if enabled else "0")
+
+
+def rss_kb():
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def clear_caches():
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    ASSETS.clear()
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(f"app raised: {at.exception[0].message}")
+    return elapsed, _RecordingRunner.last_bytes
+
+
+# ==================== MEASUREMENTS ====================
+def sample(app, timeout, reruns=3):
+    """One cold run (caches cleared), one new-session run and ``reruns`` warm reruns."""
+    clear_caches()
+    cold_ms, cold_bytes = timed_run(AppTest.from_file(app, default_timeout=timeout))
+    at = AppTest.from_file(app, default_timeout=timeout)
+    session_ms, first_bytes = timed_run(at)
+    warm = [timed_run(at) for _ in range(reruns)]
+    return {
+        "cold_ms": cold_ms,
+        "warm_ms": statistics.median(ms for ms, _ in warm),
+        "session_ms": session_ms,
+        "cold_bytes": cold_bytes,
+        "first_run_bytes": first_bytes,
+        "rerun_bytes": warm[-1][1],
+    }
+
+
+def _medians(samples):
+    medians = {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+    return {key: round(value) if key.endswith("_bytes") else round(value, 2) for key, value in medians.items()}
+
+
+def measure_runs(app, runs, timeout, variants=((),)):
+    """Median latency (ms) and payload bytes per variant of skipped blocks.
+
+    Variants are sampled round-robin, starting one further each round, so
+    drift in the process (allocator, garbage collector, CPU frequency)
+    affects them all alike.
+    """
+    samples = {variant: [] for variant in variants}
+    for i in range(runs):
+        for variant in variants[i % len(variants):] + variants[:i % len(variants)]:
+            with skipping(variant):
+                samples[variant].append(sample(app, timeout))
+    return {variant: _medians(s) for variant, s in samples.items()}
+
+
+def _open_sessions(app, sessions, timeout, tab=None):
+    open_sessions = []
+    for _ in range(sessions):
+        at = AppTest.from_file(app, default_timeout=timeout)
+        timed_run(at)
+        if tab:
+            at.session_state[tab[0]] = tab[1]
+        timed_run(at)
+        open_sessions.append(at)
+    gc.collect()
+    return open_sessions
+
+
+def traced_heap(app, sessions, timeout, tab=None):
+    """Traced heap growth (bytes) per open session: in total and without the harness' own allocations."""
+    # Warm up first: one-off imports and registrations would otherwise land on the first variant measured
+    _open_sessions(app, 2, timeout, tab)
+    gc.collect()
+    tracemalloc.start(TRACE_FRAMES)
+    before = tracemalloc.take_snapshot()
+    open_sessions = _open_sessions(app, sessions, timeout, tab)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del open_sessions
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    own = sum(
+        stat.size_diff for stat in after.filter_traces(HARNESS).compare_to(before.filter_traces(HARNESS), "filename")
+    )
+    return total / sessions, own / sessions
+
+
+def measure_sessions(app, sessions, timeout):
+    """RSS and traced Python heap growth per open session (caches already warm)."""
+    # Separate passes: tracemalloc's own bookkeeping would inflate the RSS figure
+    gc.collect()
+    rss_before = rss_kb()
+    open_sessions = _open_sessions(app, sessions, timeout)
+    rss_after = rss_kb()
+    del open_sessions
+    gc.collect()
+    heap, own = traced_heap(app, sessions, timeout)
+    return {
+        "sessions": sessions,
+        "rss_per_session_kb": round((rss_after - rss_before) / sessions, 1),
+        "heap_per_session_kb": round(heap / 1024, 1),
+        "app_heap_per_session_kb": round(own / 1024, 1),
+    }
+
+
+def measure_tabs(app, sessions, timeout, drug="entresto"):
+    """Bytes, elements and heap per session of a session's run with each tab open."""
+    key = f"{drug}_tabs"  # the app's tab state key
+    result = {}
+    for spec in load_monograph(monograph_path(drug)).tabs:
+        at = AppTest.from_file(app, default_timeout=timeout)
+        timed_run(at)
+        at.session_state[key] = spec.label
+        _, run_bytes = timed_run(at)
+        heap, own = traced_heap(app, sessions, timeout, (key, spec.label))
+        result[spec.label] = {
+            "bytes": run_bytes,
+            "elements": _RecordingRunner.last_elements,
+            "heap_per_session_kb": round(heap / 1024, 1),
+            "app_heap_per_session_kb": round(own / 1024, 1),
+        }
+    return result
+
+
+def block_costs(results):
+    """Latency and bytes each block adds, from ``measure_runs`` results over ``BLOCKS``."""
+    full = results[()]
+    return {
+        block: {key: round(full[key] - results[(block,)][key], 2) for key in full}
+        for block in BLOCKS
+    }
+
+
+def run_benchmark(app=APP, runs=5, sessions=10, timeout=60, blocks=True, tabs=False, low_memory_mode=False):
+    variants = ((),) + tuple((block,) for block in BLOCKS) if blocks else ((),)
+    with recording(), skipping([]), low_memory(low_memory_mode):
+        # The process's first run also pays for imports; keep it out of the medians
+        clear_caches()
+        first_ms, _ = timed_run(AppTest.from_file(app, default_timeout=timeout))
+        results = measure_runs(app, runs, timeout, variants)
+        result = {
+            "app": os.path.basename(app),
+            "runs": runs,
+            "low_memory": low_memory_mode,
+            "first_process_run_ms": round(first_ms, 2),
+            **results[()],
+        }
+        result.update(measure_sessions(app, sessions, timeout))
+        if tabs:
+            result["tabs"] = measure_tabs(app, sessions, timeout)
+    if blocks:
+        result["blocks"] = block_costs(results)
+    return result
+
+
+# ==================== REPORT ====================
+def compare(result, baseline, tolerance):
+    """Metrics in ``TRACKED`` that grew by more than ``tolerance`` (a fraction) over ``baseline``."""
+    regressions = {}
+    for key in TRACKED:
+        old, new = baseline.get(key), result.get(key)
+        if old and new is not None and new > old * (1 + tolerance):
+            regressions[key] = (old, new)
+    return regressions
+
+
+def report(result):
+    mode = ", low-memory mode" if result.get("low_memory") else ""
+    lines = [
+        f"{result['app']}: median of {result['runs']} runs{mode}",
+        f"  first in process  {result['first_process_run_ms']:>10.1f} ms",
+        f"  cold run          {result['cold_ms']:>10.1f} ms  {result['cold_bytes']:>9} B",
+        f"  new session       {result['session_ms']:>10.1f} ms  {result['first_run_bytes']:>9} B",
+        f"  warm rerun        {result['warm_ms']:>10.1f} ms  {result['rerun_bytes']:>9} B",
+        f"  per session       {result['rss_per_session_kb']:>10.1f} KB RSS, "
+        f"{result['heap_per_session_kb']:.1f} KB heap, {result['app_heap_per_session_kb']:.1f} KB without the harness "
+        f"({result['sessions']} sessions)",
+    ]
+    for label, cost in result.get("tabs", {}).items():
+        lines.append(
+            f"  tab {label:<22} {cost['bytes']:>7} B {cost['elements']:>4} elements, "
+            f"{cost['heap_per_session_kb']:.1f} KB heap, {cost['app_heap_per_session_kb']:.1f} KB without the harness"
+        )
+    for block, cost in result.get("blocks", {}).items():
+        lines.append(
+            f"  {block + ' block':<17} cold {cost['cold_ms']:+.1f} ms, session {cost['session_ms']:+.1f} ms, "
+            f"rerun {cost['warm_ms']:+.1f} ms, {cost['first_run_bytes']:+} B first run, {cost['rerun_bytes']:+} B rerun"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", default=APP)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--no-blocks", action="store_true", help="skip the per-block ablation runs")
+    parser.add_argument("--tabs", action="store_true", help="add a per-tab breakdown of bytes and heap per session")
+    parser.add_argument("--low-memory", action="store_true", help="measure the app's low-memory mode")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="earlier --json output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed growth before a regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    # AppTest runs without a server; silence the resulting "bare mode" warnings
+    config.set_option("logger.level", "error")
+    logger.set_log_level("error")
+
+    result = run_benchmark(
+        args.app, args.runs, args.sessions, args.timeout,
+        blocks=not args.no_blocks, tabs=args.tabs, low_memory_mode=args.low_memory,
+    )
+    print(report(result))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=1)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for key, (old, new) in regressions.items():
+            print(f"REGRESSION {key}: {old} -> {new}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Weight-based pediatric dosing, vectorized over any number of patients.
+
+``build_dose_table`` turns the monograph's pediatric bands into NumPy
+arrays once (per-kg and fixed doses per titration step, band weight limits)
+together with every whole-tablet combination of the available strengths,
+sorted by total mg. ``pediatric_doses`` then prices a whole roster of
+weights with a handful of array operations: a ``searchsorted`` for the
+weight band, one multiply for the mg doses, a rounding to oral suspension
+volume and a second ``searchsorted`` for the nearest tablet combination.
+
+Doses are total sacubitril + valsartan mg per administration, as in the
+label's mg/kg figures.
+"""
+
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+
+MAX_TABLETS = 4  # whole tablets per dose considered when rounding to tablets
+TABLET_TOLERANCE = 0.10  # a tablet combination must be within 10% of the calculated dose
+SYRINGE_ML = 0.1  # oral syringe resolution
+
+
+@dataclass(frozen=True, slots=True)
+class DoseTable:
+    frequency: str
+    bands: tuple  # weight labels, e.g. "<40 kg"
+    min_kg: np.ndarray  # (bands,) lower limit, inclusive
+    max_kg: np.ndarray  # (bands,) upper limit, exclusive (inf when open)
+    per_kg: np.ndarray  # (bands, steps) mg/kg, nan for fixed doses and past the last step
+    fixed_mg: np.ndarray  # (bands, steps) mg, nan for per-kg doses and past the last step
+    titration_weeks: np.ndarray  # (bands,)
+    fixed_tablet: np.ndarray  # (bands, steps) index into tablets of a fixed dose's own combination, else -1
+    tablet_mg: np.ndarray  # achievable whole-tablet totals, ascending
+    tablets: tuple  # ((strength label, count), ...): tablet_mg-aligned, then the fixed doses' own combinations
+    suspension_mg_per_ml: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class Step:
+    week: int
+    mg: float
+    suspension_ml: float | None
+    tablets: tuple | None  # ((strength label, count), ...), None if no combination fits
+
+
+def _total_mg(strength):
+    return sum(mg for _, mg in strength.components)
+
+
+def _tablet_combinations(strengths, max_tablets=MAX_TABLETS):
+    """Fewest-tablet combination for every total reachable with up to ``max_tablets`` tablets."""
+    best = {}
+    totals = [_total_mg(s) for s in strengths]
+    for counts in itertools.product(range(max_tablets + 1), repeat=len(strengths)):
+        if 0 < sum(counts) <= max_tablets:
+            mg = sum(c * t for c, t in zip(counts, totals))
+            if mg not in best or sum(counts) < sum(best[mg]):
+                best[mg] = counts
+    mg_sorted = sorted(best)
+    combos = tuple(
+        tuple((s.short, c) for s, c in sorted(zip(strengths, best[mg]), key=lambda sc: -_total_mg(sc[0])) if c)
+        for mg in mg_sorted
+    )
+    return np.array(mg_sorted, dtype=float), combos
+
+
+def build_dose_table(monograph):
+    strengths = {s.short: s for s in monograph.strengths}
+    bands = sorted(monograph.dosing.pediatric, key=lambda band: band.min_kg or 0.0)
+    schedules = [(band.start,) + band.steps + (band.target,) for band in bands]
+    width = max(len(schedule) for schedule in schedules)
+    per_kg = np.full((len(bands), width), np.nan)
+    fixed_mg = np.full((len(bands), width), np.nan)
+    fixed_tablet = np.full((len(bands), width), -1)
+    tablet_mg, tablets = _tablet_combinations(monograph.strengths)
+    tablets = list(tablets)
+    for i, schedule in enumerate(schedules):
+        for j, dose in enumerate(schedule):
+            if dose.mg_per_kg is not None:
+                per_kg[i, j] = dose.mg_per_kg
+            else:
+                fixed_mg[i, j] = _total_mg(strengths[dose.strength]) * dose.tablets
+                # As written in the label (72/78 is three 24/26 tablets), not the fewest-tablet combination
+                combination = ((dose.strength, dose.tablets),)
+                if combination not in tablets:
+                    tablets.append(combination)
+                fixed_tablet[i, j] = tablets.index(combination)
+    return DoseTable(
+        frequency=monograph.dosing.frequency,
+        bands=tuple(band.weight for band in bands),
+        min_kg=np.array([band.min_kg or 0.0 for band in bands]),
+        max_kg=np.array([np.inf if band.max_kg is None else band.max_kg for band in bands]),
+        per_kg=per_kg,
+        fixed_mg=fixed_mg,
+        fixed_tablet=fixed_tablet,
+        titration_weeks=np.array([band.titration_weeks for band in bands]),
+        tablet_mg=tablet_mg,
+        tablets=tuple(tablets),
+        suspension_mg_per_ml=monograph.dosing.suspension_mg_per_ml,
+    )
+
+
+def pediatric_doses(table, weights_kg):
+    """Titration schedules for every weight in ``weights_kg`` at once.
+
+    Returns a dict of arrays: ``band`` (n,) index into ``table.bands``, -1 when
+    no band covers the weight; and, per titration step (n, steps), ``week``
+    it starts, ``mg`` per dose, ``suspension_ml`` rounded to the syringe and
+    ``tablet`` index into ``table.tablets``: a fixed dose's own combination,
+    else the nearest one (-1 when none is within ``TABLET_TOLERANCE``). Missing steps and uncovered weights are nan / -1.
+    """
+    weights = np.asarray(weights_kg, dtype=float).reshape(-1)
+    band = np.searchsorted(table.min_kg, weights, side="right") - 1
+    covered = (band >= 0) & (weights > 0)
+    covered &= weights < table.max_kg[np.clip(band, 0, None)]
+    band = np.where(covered, band, -1)
+    rows = np.clip(band, 0, None)
+
+    mg = np.where(np.isnan(table.per_kg[rows]), table.fixed_mg[rows], table.per_kg[rows] * weights[:, None])
+    mg[~covered] = np.nan
+    steps = np.arange(mg.shape[1])
+    week = np.where(np.isnan(mg), np.nan, steps * table.titration_weeks[rows][:, None])
+
+    if table.suspension_mg_per_ml:
+        # Round to whole syringe graduations, then drop the float noise of the multiply
+        suspension_ml = np.round(np.round(mg / table.suspension_mg_per_ml / SYRINGE_ML) * SYRINGE_ML, 6)
+    else:
+        suspension_ml = np.full_like(mg, np.nan)
+
+    # Nearest tablet total: compare the neighbours on either side of each dose
+    upper = np.clip(np.searchsorted(table.tablet_mg, mg), 0, len(table.tablet_mg) - 1)
+    lower = np.clip(upper - 1, 0, None)
+    nearest = np.where(np.abs(table.tablet_mg[lower] - mg) <= np.abs(table.tablet_mg[upper] - mg), lower, upper)
+    fits = np.abs(table.tablet_mg[nearest] - mg) <= TABLET_TOLERANCE * mg
+    tablet = np.where(table.fixed_tablet[rows] >= 0, table.fixed_tablet[rows], np.where(fits, nearest, -1))
+    tablet[~covered] = -1
+
+    return {"band": band, "week": week, "mg": mg, "suspension_ml": suspension_ml, "tablet": tablet}
+
+
+def pediatric_schedule(table, weight_kg):
+    """The titration steps for one weight; empty when no band covers it."""
+    doses = pediatric_doses(table, [weight_kg])
+    if doses["band"][0] < 0:
+        return ()
+    return tuple(
+        Step(
+            week=int(doses["week"][0, j]),
+            mg=float(doses["mg"][0, j]),
+            suspension_ml=None if np.isnan(doses["suspension_ml"][0, j]) else float(doses["suspension_ml"][0, j]),
+            tablets=table.tablets[doses["tablet"][0, j]] if doses["tablet"][0, j] >= 0 else None,
+        )
+        for j in range(doses["mg"].shape[1])
+        if not np.isnan(doses["mg"][0, j])
+    )
+
+
+def tablets_text(tablets):
+    return " + ".join(f"{count} × {label} mg" for label, count in tablets)
@@ -0,0 +1,243 @@
+"""
+Static-site export: the whole app as prebuilt HTML.
+
+    python -m pharmacode.export OUT_DIR [--drug entresto] [--ga-id G-XXXX]
+
+Renders the header (title and responsive drug image), all tabs and the
+footer of a monograph into ``OUT_DIR/index.html``. The stylesheet (app.css
+plus the page shell in ``styles/export.css``), the image variants and the
+optional analytics tracker are written under fingerprinted names, so
+everything except ``index.html`` can be cached as immutable. Tabs switch
+with CSS alone (one radio input per tab) and expanders are ``<details>``;
+the page needs no JavaScript. Interactive widgets (the dose calculator)
+have no static form and are left out. ``manifest.json`` lists the bundle's files.
+With ``--pwa`` the bundle also works offline (see ``pharmacode.pwa``).
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+from dataclasses import dataclass
+
+from pharmacode.analytics import SCRIPT_ID, build_tracker
+from pharmacode.assets import resolve_asset, write_fingerprinted
+from pharmacode.images import build_icons, build_variants, picture_html
+from pharmacode.model import load_monograph, monograph_path
+from pharmacode.pwa import SW_NAME, WEBMANIFEST, bundle_version, head_html, service_worker_js, webmanifest_json
+from pharmacode.render import Callout, Columns, Divider, Expander, Header, Html, Markdown, prepare_tabs
+from pharmacode.styles import STYLESHEET, minify_css
+from pharmacode.templates import build_tabs, footer_html, inline, title_html
+
+EXPORT_STYLESHEET = os.path.join(os.path.dirname(STYLESHEET), "export.css")
+# Where the app looks for the drug image: next to the app script, then one level up
+IMAGE_DIRS = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))),)
+IMAGE_DIRS += (os.path.dirname(IMAGE_DIRS[0]),)
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="icon" href="data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 100 100%22><text y=%22.9em%22 font-size=%2290%22>💊</text></svg>">
+<link rel="stylesheet" href="{stylesheet}">
+{pwa}{analytics}</head>
+<body>
+<div class="page">
+{header}
+<hr>
+{tabs}
+<hr>
+{footer}
+</div>
+</body>
+</html>
+"""
+TAB_RULES = (
+    '.stTabs>input:nth-of-type({n}):checked~section:nth-of-type({n}){{display:block}}'
+    '.stTabs>input:nth-of-type({n}):checked~[data-baseweb="tab-list"]>label:nth-of-type({n})'
+    '{{background-color:#0460A9;color:white}}'
+    '.stTabs>input:nth-of-type({n}):focus-visible~[data-baseweb="tab-list"]>label:nth-of-type({n})'
+    '{{outline:2px solid #0878C8}}'
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Bundle:
+    out_dir: str
+    version: str
+    files: tuple  # paths relative to out_dir, index.html first
+
+
+# ==================== MARKDOWN ====================
+def markdown_html(text):
+    """The markdown subset used by callouts and headings: ``#`` headings, ``- `` lists, paragraphs."""
+    out = []
+    for chunk in text.split("\n\n"):
+        paragraph, items = [], []
+
+        def close():
+            if paragraph:
+                out.append("<p>" + "".join(paragraph).strip() + "</p>")
+                paragraph.clear()
+            if items:
+                out.append("<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>")
+                items.clear()
+
+        for line in chunk.splitlines():
+            heading = _HEADING.match(line)
+            if heading:
+                close()
+                level = len(heading.group(1))
+                out.append(f"<h{level}>{inline(heading.group(2))}</h{level}>")
+            elif line.startswith("- "):
+                if paragraph:
+                    close()
+                items.append(inline(line[2:].strip()))
+            else:
+                if items:
+                    close()
+                # Two trailing spaces are a markdown hard line break
+                paragraph.append(inline(line.strip()) + ("<br>" if line.endswith("  ") else " "))
+        close()
+    return "\n".join(out)
+
+
+# ==================== BLOCKS ====================
+def blocks_html(blocks):
+    parts = []
+    for block in blocks:
+        if isinstance(block, Html):
+            parts.append(block.text)
+        elif isinstance(block, Markdown):
+            parts.append(markdown_html(block.text))
+        elif isinstance(block, Header):
+            parts.append(f"<h2>{html.escape(block.text, quote=False)}</h2>")
+        elif isinstance(block, Callout):
+            parts.append(f'<div class="callout callout-{block.kind}">\n{markdown_html(block.text)}\n</div>')
+        elif isinstance(block, Divider):
+            parts.append("<hr>")
+        elif isinstance(block, Expander):
+            body = blocks_html(block.blocks)
+            if not body:
+                continue  # only interactive widgets inside
+            parts.append(
+                f'<div class="st-expander"><details>\n<summary><span>{html.escape(block.label, quote=False)}</span></summary>\n'
+                f"<div>\n{body}\n</div>\n</details></div>"
+            )
+        elif isinstance(block, Columns):
+            columns = "\n".join(f'<div class="column">\n{blocks_html(column)}\n</div>' for column in block.columns)
+            parts.append(f'<div class="columns">\n{columns}\n</div>')
+    return "\n".join(parts)
+
+
+def tabs_html(tabs):
+    """CSS-only tabs: ``data-baseweb`` attributes reuse the app's tab styles (and its click tracking)."""
+    inputs = "\n".join(
+        f'<input type="radio" name="tab" id="tab-{tab.key}"{" checked" if i == 0 else ""}>' for i, tab in enumerate(tabs)
+    )
+    labels = "\n".join(
+        f'<label for="tab-{tab.key}" data-baseweb="tab">{html.escape(tab.label, quote=False)}</label>' for tab in tabs
+    )
+    panels = "\n".join(f'<section id="{tab.key}">\n{blocks_html(tab.blocks)}\n</section>' for tab in tabs)
+    return f'<div class="stTabs">\n{inputs}\n<div data-baseweb="tab-list">\n{labels}\n</div>\n{panels}\n</div>'
+
+
+def site_css(tab_count):
+    with open(STYLESHEET, encoding="utf-8") as f:
+        app = f.read()
+    with open(EXPORT_STYLESHEET, encoding="utf-8") as f:
+        shell = f.read()
+    rules = "".join(TAB_RULES.format(n=n) for n in range(1, tab_count + 1))
+    return minify_css(app + "\n" + shell) + rules
+
+
+def analytics_tag(src, ga_id, app_name):
+    """The tracker reads its settings from its own ``<script>`` tag, as in the app."""
+    attrs = {"id": SCRIPT_ID, "src": src, "data-ga-id": ga_id, "data-app-name": app_name}
+    return "<script " + " ".join(f'{k}="{html.escape(v)}"' for k, v in attrs.items()) + " defer></script>\n"
+
+
+def _write_text(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# ==================== EXPORT ====================
+def export_site(monograph, out_dir, image_dirs=IMAGE_DIRS, ga_id=None, app_name=None, pwa=False):
+    """Write ``monograph`` as a static bundle in ``out_dir``; ``pwa`` adds the offline service worker."""
+    drug = monograph.drug
+    tabs = prepare_tabs(build_tabs(monograph))
+    os.makedirs(out_dir, exist_ok=True)
+    files = []
+
+    stylesheet = write_fingerprinted(site_css(len(tabs)).encode("utf-8"), os.path.join(out_dir, "css"), "site", "css")
+    files.append(f"css/{stylesheet}")
+
+    header = title_html(drug)
+    image_path = resolve_asset(drug.image, *image_dirs) if drug.image else None
+    if image_path:
+        image_set = build_variants(image_path, os.path.join(out_dir, "img"))
+        header = picture_html(image_set, "img/", f"{drug.brand} ({drug.generic})") + "\n" + header
+        files.extend(f"img/{v.filename}" for v in image_set.variants + (image_set.fallback,))
+
+    pwa_head = ""
+    if pwa:
+        icons = build_icons(image_path, os.path.join(out_dir, "img")) if image_path else ()
+        files.extend(f"img/{icon.filename}" for icon in icons)
+        _write_text(os.path.join(out_dir, WEBMANIFEST), webmanifest_json(drug, icons, "img/"))
+        pwa_head = head_html()
+
+    analytics = ""
+    if ga_id:
+        tracker = build_tracker(out_dir=os.path.join(out_dir, "js"))
+        files.append(f"js/{tracker.filename}")
+        analytics = analytics_tag(files[-1], ga_id, app_name or drug.brand)
+
+    page = PAGE.format(
+        title=html.escape(drug.page_title),
+        stylesheet=f"css/{stylesheet}",
+        pwa=pwa_head,
+        analytics=analytics,
+        header=header,
+        tabs=tabs_html(tabs),
+        footer=footer_html(drug),
+    )
+    _write_text(os.path.join(out_dir, "index.html"), page)
+    if pwa:
+        # Written last: its version covers index.html and the web app manifest
+        precache = ["index.html", WEBMANIFEST] + files
+        version = bundle_version(out_dir, files, precache[:2])
+        _write_text(os.path.join(out_dir, SW_NAME), service_worker_js(version, precache))
+        files += [WEBMANIFEST, SW_NAME]
+    _write_text(
+        os.path.join(out_dir, "manifest.json"),
+        json.dumps({"version": monograph.version, "files": ["index.html"] + files}, indent=1),
+    )
+    return Bundle(out_dir, monograph.version, ("index.html",) + tuple(files))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a drug monograph as a static site.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--drug", default="entresto", help="monograph key (pharmacode/monographs/<key>.json)")
+    parser.add_argument("--ga-id", help="Google Analytics id; no tracker is included without one")
+    parser.add_argument("--app-name", help="analytics app_name (default: the brand name)")
+    parser.add_argument("--pwa", action="store_true", help="add a web app manifest and an offline service worker")
+    args = parser.parse_args(argv)
+
+    bundle = export_site(
+        load_monograph(monograph_path(args.drug)), args.out_dir, ga_id=args.ga_id, app_name=args.app_name, pwa=args.pwa
+    )
+    total = sum(os.path.getsize(os.path.join(bundle.out_dir, name)) for name in bundle.files)
+    print(f"{len(bundle.files)} files, {total / 1024:.0f} KB -> {bundle.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Responsive image variants for the drug box picture.
+
+The source PNG is resized once into width buckets and encoded as AVIF/WebP
+(whatever this Pillow build supports) plus a small PNG fallback. Variants
+are cached on disk under a name derived from the source hash, so a changed
+image gets new files and URLs while an unchanged one is never re-encoded.
+``build_icons`` makes the square home-screen icons of the offline build.
+Pillow is imported by the functions that encode: the app imports this module
+for ``picture_html`` on its first run, before any image work is due.
+"""
+
+import hashlib
+import html
+import os
+from dataclasses import dataclass
+
+VARIANT_WIDTHS = (320, 640, 960, 1280)
+FALLBACK_WIDTH = 640
+# Middle column of the [1, 2, 1] header layout; columns stack on mobile
+DEFAULT_SIZES = "(max-width: 768px) 100vw, 50vw"
+
+ENCODERS = (
+    # (format, mime type, Pillow save options)
+    ("avif", "image/avif", {"quality": 55, "speed": 6}),
+    ("webp", "image/webp", {"quality": 80, "method": 6}),
+)
+# Palette PNG: only browsers without AVIF/WebP ever fetch it
+FALLBACK = ("png", "image/png", {"optimize": True})
+# Home-screen icons of the offline build (pharmacode.pwa)
+ICON_SIZES = (192, 512)
+ICON_BACKGROUND = "#ffffff"
+
+
+@dataclass(frozen=True, slots=True)
+class Variant:
+    width: int
+    format: str
+    mime: str
+    filename: str
+    size: int
+
+
+@dataclass(frozen=True, slots=True)
+class ImageSet:
+    source: str
+    digest: str
+    width: int
+    height: int
+    variants: tuple
+    fallback: Variant
+
+    def by_format(self, fmt):
+        return tuple(v for v in self.variants if v.format == fmt)
+
+
+def source_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def supported_encoders():
+    from PIL import features
+
+    return tuple(enc for enc in ENCODERS if features.check(enc[0]))
+
+
+def _save(render, path, fmt, options):
+    if not os.path.exists(path):
+        tmp = f"{path}.tmp"
+        render().save(tmp, format=fmt.upper(), **options)
+        os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+def build_variants(path, out_dir, widths=VARIANT_WIDTHS):
+    """Encode (or reuse) every width/format variant of ``path`` in ``out_dir``."""
+    from PIL import Image
+
+    digest = source_digest(path)
+    stem = os.path.splitext(os.path.basename(path))[0].lower()
+    os.makedirs(out_dir, exist_ok=True)
+    with Image.open(path) as source:
+        width, height = source.size
+        resized = {}
+
+        def render(w, palette=False):
+            # Decoding and resizing only happen when a variant file is missing
+            if w not in resized:
+                source.load()
+                resized[w] = source if w == width else source.resize((w, round(height * w / width)), Image.LANCZOS)
+            return resized[w].quantize(256, method=Image.Quantize.FASTOCTREE) if palette else resized[w]
+
+        variants = []
+        for w in sorted({min(w, width) for w in widths}):
+            for fmt, mime, options in supported_encoders():
+                name = f"{stem}-{digest}-{w}.{fmt}"
+                size = _save(lambda: render(w), os.path.join(out_dir, name), fmt, options)
+                variants.append(Variant(w, fmt, mime, name, size))
+        w = min(FALLBACK_WIDTH, width)
+        fmt, mime, options = FALLBACK
+        name = f"{stem}-{digest}-{w}.{fmt}"
+        fallback = Variant(w, fmt, mime, name, _save(lambda: render(w, palette=True), os.path.join(out_dir, name), fmt, options))
+    return ImageSet(path, digest, width, height, tuple(variants), fallback)
+
+
+def build_icons(path, out_dir, sizes=ICON_SIZES, background=ICON_BACKGROUND):
+    """Square PNG app icons of ``path``, letterboxed on ``background``; cached on disk like the variants."""
+    from PIL import Image
+
+    digest = source_digest(path)
+    stem = os.path.splitext(os.path.basename(path))[0].lower()
+    os.makedirs(out_dir, exist_ok=True)
+    with Image.open(path) as source:
+
+        def render(size):
+            source.load()
+            image = source.convert("RGBA")
+            image.thumbnail((size, size), Image.LANCZOS)
+            icon = Image.new("RGBA", (size, size), background)
+            icon.alpha_composite(image, ((size - image.width) // 2, (size - image.height) // 2))
+            return icon.convert("RGB").quantize(256, method=Image.Quantize.FASTOCTREE)
+
+        icons = []
+        for size in sizes:
+            name = f"{stem}-{digest}-icon-{size}.png"
+            file_size = _save(lambda: render(size), os.path.join(out_dir, name), "png", {"optimize": True})
+            icons.append(Variant(size, "png", "image/png", name, file_size))
+    return tuple(icons)
+
+
+def picture_html(image_set, url_prefix, alt, sizes=DEFAULT_SIZES):
+    """``<picture>`` markup letting the browser pick the smallest fitting variant."""
+    sources = []
+    for fmt, mime, _ in ENCODERS:
+        variants = image_set.by_format(fmt)
+        if variants:
+            srcset = ", ".join(f"{url_prefix}{v.filename} {v.width}w" for v in variants)
+            sources.append(f'    <source type="{mime}" srcset="{srcset}" sizes="{sizes}">')
+    fallback = image_set.fallback
+    return (
+        '<div class="drug-image-container"><picture>\n'
+        + "\n".join(sources)
+        + f'\n    <img src="{url_prefix}{fallback.filename}" alt="{html.escape(alt)}"'
+        f' width="{image_set.width}" height="{image_set.height}"'
+        ' style="width: 100%; height: auto;" decoding="async">\n'
+        "</picture></div>"
+    )
@@ -0,0 +1,140 @@
+"""
+Drug-interaction lookup over a medication list.
+
+    python -m pharmacode.interactions "lisinopril 10 mg" Aleve atorvastatin [--drug entresto]
+    python -m pharmacode.interactions --file med_lists.txt  # one comma-separated list per line
+
+``build_interaction_index`` hashes every generic name, brand name and class
+alias of the monograph's interactions (``members`` / ``aliases``) under its
+normalized form once. ``InteractionIndex.check`` then scans each medication
+entry's words against that dict: a few lookups per word, so a list is
+checked in time linear in its length. Entries may carry strengths, salts
+and forms ("Metformin HCl 500 mg tab") or several drugs ("lisinopril/HCTZ").
+"""
+
+import argparse
+import re
+import sys
+import unicodedata
+from dataclasses import dataclass
+
+from pharmacode.model import load_monograph, monograph_path
+
+# Most severe first; findings are reported in this order
+GROUP_ORDER = ("contraindicated", "monitor", "transporter", "safe")
+_SEPARATORS = re.compile(r"[\n,;]+")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+@dataclass(frozen=True, slots=True)
+class Finding:
+    medication: str  # the list entry as given
+    drug: str  # generic name or class alias it matched
+    interaction: object  # pharmacode.model.Interaction
+
+    @property
+    def group(self):
+        return self.interaction.group
+
+
+@dataclass(frozen=True, slots=True)
+class Report:
+    findings: tuple  # Findings, most severe first
+    unmatched: tuple  # entries with no known interaction
+
+    @property
+    def severity(self):
+        """The most severe group found, None when nothing matched."""
+        return self.findings[0].group if self.findings else None
+
+
+def normalize(name):
+    """Lower-case ASCII words: "Klor-Con®" -> "klor con"."""
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def parse_medications(text):
+    """Split free text into entries: one per line, comma or semicolon."""
+    return [entry.strip() for entry in _SEPARATORS.split(text) if entry.strip()]
+
+
+class InteractionIndex:
+    def __init__(self, interactions):
+        self.interactions = tuple(interactions)
+        self.names = {}  # normalized name -> ((interaction position, generic or alias), ...)
+        for position, interaction in enumerate(self.interactions):
+            for generic, brands in interaction.members:
+                for name in (generic,) + brands:
+                    self._add(name, position, generic)
+            for alias in interaction.aliases:
+                self._add(alias, position, alias)
+        self.max_words = max((key.count(" ") + 1 for key in self.names), default=1)
+
+    def _add(self, name, position, drug):
+        key = normalize(name)
+        entries = self.names.get(key, ())
+        if (position, drug) not in entries:
+            self.names[key] = entries + ((position, drug),)
+
+    def lookup(self, medication):
+        """(interaction, drug) pairs named in one entry; longest names win, left to right."""
+        words = normalize(medication).split()
+        found = []
+        i = 0
+        while i < len(words):
+            for length in range(min(self.max_words, len(words) - i), 0, -1):
+                entries = self.names.get(" ".join(words[i:i + length]))
+                if entries:
+                    found.extend((self.interactions[position], drug) for position, drug in entries)
+                    i += length
+                    break
+            else:
+                i += 1
+        return found
+
+    def check(self, medications):
+        """Check a medication list; each interaction is reported once per entry."""
+        findings, unmatched = [], []
+        for medication in medications:
+            seen = set()
+            for interaction, drug in self.lookup(medication):
+                if id(interaction) not in seen:
+                    seen.add(id(interaction))
+                    findings.append(Finding(medication, drug, interaction))
+            if not seen:
+                unmatched.append(medication)
+        findings.sort(key=lambda finding: GROUP_ORDER.index(finding.group))
+        return Report(tuple(findings), tuple(unmatched))
+
+
+def build_interaction_index(monograph):
+    return InteractionIndex(monograph.interactions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check medication lists against a drug monograph's interactions.")
+    parser.add_argument("medications", nargs="*", help="medication list entries")
+    parser.add_argument("--file", help="file with one comma-separated medication list per line")
+    parser.add_argument("--drug", default="entresto", help="monograph key (pharmacode/monographs/<key>.json)")
+    args = parser.parse_args(argv)
+    if not args.medications and not args.file:
+        parser.error("give medications or --file")
+
+    index = build_interaction_index(load_monograph(monograph_path(args.drug)))
+    lists = [args.medications] if args.medications else []
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            lists.extend(parse_medications(line) for line in f)
+    out = sys.stdout
+    out.write("list\tmedication\tdrug\tgroup\taction\tsource\n")
+    for number, medications in enumerate(lists, 1):
+        for finding in index.check(medications).findings:
+            interaction = finding.interaction
+            fields = (number, finding.medication, finding.drug, finding.group,
+                      interaction.action or interaction.note or "", interaction.source or "")
+            out.write("\t".join(str(field) for field in fields) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Load test of app replicas behind a local stand-in load balancer.
+
+    python -m pharmacode.loadtest run [--replicas 1,2,4] [--users 16] [--duration 20] [--json out.json]
+    python -m pharmacode.loadtest balance --port 8500 127.0.0.1:8601 127.0.0.1:8602
+
+``run`` measures each replica count in turn. It starts that many app
+servers (``python -m pharmacode.serve``) on consecutive ports, with
+``Balancer`` in front of them. ``--users`` virtual users then open sessions
+through the balancer. A session is what a browser tab costs: the
+websocket, one script run up to its ``script_finished`` message, then the
+close. Each user starts its next session until ``--duration`` has passed.
+One warm-up session per replica runs first, so per-process caches are not
+measured. The report gives, per replica count:
+- throughput in sessions per second;
+- session latency;
+- each replica's RSS;
+- scaling efficiency: throughput over replicas x the single-replica
+  throughput, 1.0 when scaling is linear.
+
+Replicas are processes, so throughput grows with the cores they get; the
+report prints the core count. The virtual users and the balancer run on
+the same host and take a share too: with N cores, expect scaling close to
+1.0 up to about N - 1 replicas, and flat throughput past N. Build the
+artifact first (``python -m pharmacode.artifact build``): every replica
+then maps the same file instead of rendering and indexing the content
+itself.
+
+``balance`` runs the balancer alone, in front of replicas started by hand.
+It picks a backend per TCP connection, round-robin. A Streamlit session is
+one websocket, so it stays on its replica without sticky cookies.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_PORT = 8601
+BALANCER_PORT = 8600
+STARTUP_TIMEOUT = 60.0  # s for a replica to answer its health check
+CHUNK = 64 * 1024
+
+
+# ==================== BALANCER ====================
+async def _pipe(reader, writer):
+    try:
+        while data := await reader.read(CHUNK):
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+class Balancer:
+    """Round-robin TCP balancer: each connection goes to the next backend and is piped both ways."""
+
+    def __init__(self, backends):
+        self.backends = tuple(backends)  # (host, port)
+        self.connections = dict.fromkeys(self.backends, 0)
+        self._next = itertools.cycle(self.backends)
+
+    async def handle(self, reader, writer):
+        backend = next(self._next)
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(*backend)
+        except OSError:
+            writer.close()
+            return
+        self.connections[backend] += 1
+        await asyncio.gather(_pipe(reader, upstream_writer), _pipe(upstream_reader, writer))
+
+    async def start(self, host="127.0.0.1", port=BALANCER_PORT):
+        return await asyncio.start_server(self.handle, host, port)
+
+
+# ==================== REPLICAS ====================
+def _healthy(port):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2) as response:
+            return response.status == 200
+    except (OSError, urllib.error.URLError):
+        return False
+
+
+@contextlib.contextmanager
+def replicas(count, base_port=BASE_PORT):
+    """``count`` app servers on consecutive ports from ``base_port``; yields their processes once all are healthy."""
+    env = dict(os.environ, STREAMLIT_BROWSER_GATHER_USAGE_STATS="false")
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "pharmacode.serve", "--host", "127.0.0.1", "--port", str(base_port + i)],
+            cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        for i in range(count)
+    ]
+    try:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        for i, process in enumerate(processes):
+            while not _healthy(base_port + i):
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"replica on port {base_port + i} did not start")
+                time.sleep(0.2)
+        yield processes
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=30)
+
+
+def rss_mb(pid):
+    """Resident set size of a process (Linux), None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            kb = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+    except (OSError, StopIteration):
+        return None
+    return kb / 1024
+
+
+# ==================== VIRTUAL USERS ====================
+async def open_session(url, query_string):
+    """One browser session: connect, run the script once, close. Returns (seconds, bytes received)."""
+    import websockets
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    started = time.perf_counter()
+    received = 0
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+        message = BackMsg()
+        message.rerun_script.query_string = query_string
+        message.rerun_script.page_script_hash = ""
+        await ws.send(message.SerializeToString())
+        while True:
+            data = await ws.recv()
+            received += len(data)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            if forward.WhichOneof("type") == "script_finished":
+                if forward.script_finished == forward.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("the app script failed to compile")
+                break
+    return time.perf_counter() - started, received
+
+
+async def _try_session(url, query_string, errors):
+    """``open_session``, with a failed session (refused, dropped, rejected) counted in ``errors``: None."""
+    from websockets.exceptions import WebSocketException
+
+    try:
+        return await open_session(url, query_string)
+    except (OSError, RuntimeError, asyncio.TimeoutError, WebSocketException) as exc:
+        errors.append(f"{type(exc).__name__}: {exc}")
+        return None
+
+
+async def _user(url, query_string, deadline, latencies, sizes, errors):
+    while time.perf_counter() < deadline:
+        result = await _try_session(url, query_string, errors)
+        if result is None:
+            await asyncio.sleep(0.1)
+            continue
+        latencies.append(result[0])
+        sizes.append(result[1])
+
+
+async def drive(backends, users, duration, drug="entresto", port=BALANCER_PORT):
+    """Put ``users`` concurrent users on ``backends`` through a balancer for ``duration`` seconds."""
+    balancer = Balancer(backends)
+    server = await balancer.start(port=port)
+    url, query_string = f"ws://127.0.0.1:{port}/_stcore/stream", f"drug={drug}"
+    latencies, sizes, errors = [], [], []
+    try:
+        for _ in backends:
+            await _try_session(url, query_string, errors)  # warm-up: one session per replica, round-robin
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            _user(url, query_string, started + duration, latencies, sizes, errors) for _ in range(users)
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        server.close()
+        await server.wait_closed()
+    quantiles = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else [0.0] * 19
+    return {
+        "sessions": len(latencies),
+        "errors": len(errors),  # warm-up included
+        "error_samples": sorted(set(errors))[:5],
+        "sessions_per_s": len(latencies) / elapsed,
+        "p50_ms": quantiles[9] * 1000,
+        "p95_ms": quantiles[18] * 1000,
+        "kb_per_session": statistics.mean(sizes) / 1024 if sizes else 0.0,
+        "sessions_per_replica": [count - 1 for count in balancer.connections.values()],
+    }
+
+
+def run_load_test(replica_counts, users, duration, drug="entresto", base_port=BASE_PORT, balancer_port=BALANCER_PORT):
+    results = []
+    for count in replica_counts:
+        with replicas(count, base_port) as processes:
+            backends = [("127.0.0.1", base_port + i) for i in range(count)]
+            result = asyncio.run(drive(backends, users, duration, drug, balancer_port))
+            result["replicas"] = count
+            result["rss_mb"] = [rss_mb(process.pid) for process in processes]
+        results.append(result)
+    single = next((r["sessions_per_s"] / r["replicas"] for r in results if r["replicas"] == 1), None)
+    for result in results:
+        result["scaling"] = result["sessions_per_s"] / (result["replicas"] * single) if single else None
+    return results
+
+
+def artifact_status(drug):
+    from pharmacode.artifact import artifact_path, open_artifact
+    from pharmacode.model import monograph_path
+    from pharmacode.versioning import load_section_hashes
+
+    path = artifact_path(drug)
+    if not os.path.exists(path):
+        return "none (python -m pharmacode.artifact build)"
+    current = open_artifact(path, load_section_hashes(monograph_path(drug))) is not None
+    return f"{os.path.relpath(path, APP_DIR)} ({'current' if current else 'stale, ignored'})"
+
+
+def report(results, users, duration, drug, out=sys.stdout):
+    out.write(f"{os.cpu_count()} CPU cores, {users} users, {duration:g} s per run; artifact: {artifact_status(drug)}\n")
+    out.write("replicas  sessions/s  scaling  p50 ms  p95 ms  KB/session  errors  RSS/replica MB\n")
+    for r in results:
+        scaling = f"{r['scaling']:.2f}" if r["scaling"] is not None else "-"
+        rss = " ".join(f"{mb:.0f}" for mb in r["rss_mb"] if mb is not None) or "-"
+        out.write(
+            f"{r['replicas']:>8}  {r['sessions_per_s']:>10.1f}  {scaling:>7}  {r['p50_ms']:>6.0f}  {r['p95_ms']:>6.0f}"
+            f"  {r['kb_per_session']:>10.1f}  {r['errors']:>6}  {rss}\n"
+        )
+    if max(r["replicas"] for r in results) > (os.cpu_count() or 1):
+        out.write("More replicas than cores: throughput past the core count is not expected to grow.\n")
+
+
+def _backend(text):
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test app replicas behind a local stand-in balancer.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="start replicas and measure throughput per replica count")
+    run.add_argument("--replicas", default="1,2,4", help="comma-separated replica counts")
+    run.add_argument("--users", type=int, default=16, help="concurrent virtual users")
+    run.add_argument("--duration", type=float, default=20.0, help="seconds of load per replica count")
+    run.add_argument("--drug", default="entresto", help="monograph key (pharmacode/monographs/<key>.json)")
+    run.add_argument("--base-port", type=int, default=BASE_PORT, help="first replica port")
+    run.add_argument("--port", type=int, default=BALANCER_PORT, help="balancer port")
+    run.add_argument("--json", help="also write the results to this file")
+    balance = commands.add_parser("balance", help="run the balancer alone in front of running replicas")
+    balance.add_argument("backends", nargs="+", type=_backend, help="host:port of each replica")
+    balance.add_argument("--host", default="127.0.0.1")
+    balance.add_argument("--port", type=int, default=BALANCER_PORT)
+    args = parser.parse_args(argv)
+
+    if args.command == "balance":
+        async def serve():
+            server = await Balancer(args.backends).start(args.host, args.port)
+            async with server:
+                await server.serve_forever()
+
+        asyncio.run(serve())
+        return
+    counts = [int(count) for count in args.replicas.split(",")]
+    results = run_load_test(counts, args.users, args.duration, args.drug, args.base_port, args.port)
+    report(results, args.users, args.duration, args.drug)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(json.dumps(results, indent=1) + "\n")
+
+
+if __name__ == "__main__":
+    main()
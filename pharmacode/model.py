@@ -0,0 +1,639 @@
+"""
+Typed drug-monograph model loaded from a single JSON file.
+
+Clinical facts (strengths, dosing, PK parameters, contraindications, adverse
+reactions, interactions, comparison drugs, references) are typed records;
+the tab layout is a tree of ``pharmacode.render`` blocks plus three content
+blocks (``Box``, ``Cards``, ``Section``) that ``pharmacode.templates`` turns
+into HTML. The loader validates the file and raises ``ValueError`` naming
+the offending path, so a bad label update fails at startup, not mid-page.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+
+from pharmacode.render import Callout, Columns, Divider, Expander, Markdown, Widget
+
+SCHEMA_VERSION = 1
+MONOGRAPH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "monographs")
+
+
+# ==================== CLINICAL FACTS ====================
+@dataclass(frozen=True, slots=True)
+class Condition:
+    field: str  # patient record field, see PATIENT_FIELDS
+    op: str
+    value: object
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    when: tuple  # Conditions, all of which must hold
+    severity: str  # "contraindicated" | "avoid" | "caution"
+    label: str | None = None  # flag text when it differs from the contraindication title
+
+
+@dataclass(frozen=True, slots=True)
+class DrugInfo:
+    key: str
+    brand: str
+    generic: str
+    page_title: str
+    title: str
+    subtitle: str
+    updated: str
+    image: str
+
+
+@dataclass(frozen=True, slots=True)
+class Strength:
+    components: tuple  # ((component, mg), ...)
+    form: str
+    role: str
+
+    @property
+    def short(self):
+        """``"49/51"`` style label used in dosing text."""
+        return "/".join(f"{mg:g}" for _, mg in self.components)
+
+
+@dataclass(frozen=True, slots=True)
+class Regimen:
+    step: str
+    strength: str
+    frequency: str
+    note: str
+    when: tuple = ()  # Conditions selecting this regimen as the starting dose
+
+
+@dataclass(frozen=True, slots=True)
+class Dose:
+    mg_per_kg: float | None = None
+    strength: str | None = None
+    tablets: int = 1  # whole tablets of ``strength`` per dose, e.g. 3 x 24/26 for 72/78
+
+
+@dataclass(frozen=True, slots=True)
+class PediatricBand:
+    weight: str
+    min_kg: float | None
+    max_kg: float | None
+    start: Dose
+    target: Dose
+    titration_weeks: int
+    steps: tuple = ()  # intermediate doses between start and target
+
+
+@dataclass(frozen=True, slots=True)
+class DoseAdjustment:
+    population: str  # "renal" | "hepatic"
+    icon: str
+    title: str
+    start: str | None  # starting strength, None when not recommended
+    note: str
+    when: tuple = ()  # Conditions identifying the population
+
+
+@dataclass(frozen=True, slots=True)
+class Dosing:
+    frequency: str
+    adult: tuple
+    pediatric: tuple
+    adjustments: tuple
+    suspension_mg_per_ml: float | None = None  # oral suspension for weight-based doses
+    pediatric_min_age_years: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PKProfile:
+    analyte: str
+    title: str
+    bioavailability: str | None
+    tmax_h: float
+    half_life_h: float
+    half_life_note: str | None
+    protein_binding: str
+    metabolism: str
+    excretion: str
+    parent: str | None = None  # analyte this one is formed from (a metabolite), else dosed itself
+
+
+@dataclass(frozen=True, slots=True)
+class Contraindication:
+    title: str
+    risk: str
+    action: str
+    screen: tuple = ()  # Rules flagging a patient record
+
+
+@dataclass(frozen=True, slots=True)
+class Subgroup:
+    name: str  # e.g. "Black patients"
+    incidence_pct: float
+    comparator_pct: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class AdverseReaction:
+    icon: str
+    name: str
+    incidence_pct: float
+    comparator_pct: float | None
+    badge: str
+    note: str
+    comparator: str | None = None  # arm of comparator_pct, e.g. "Enalapril"
+    subgroups: tuple = ()  # Subgroups with their own incidence
+    listed: bool = True  # shown among the common reactions; False for rare ones kept for the charts
+
+
+@dataclass(frozen=True, slots=True)
+class Interaction:
+    name: str
+    group: str  # "contraindicated" | "monitor" | "transporter" | "safe"
+    mechanism: str | None
+    consequence: str | None
+    action: str | None
+    source: str | None
+    note: str | None
+    members: tuple = ()  # ((generic name, (brand names, ...)), ...) the entry covers
+    aliases: tuple = ()  # class names, e.g. "ACE inhibitor"
+
+
+@dataclass(frozen=True, slots=True)
+class ComparisonDrug:
+    icon: str
+    name: str
+    drug_class: str
+    use: str
+    mechanism: str
+    key_toxicity: str
+    food: str
+    efficacy: str
+    featured: bool
+
+
+@dataclass(frozen=True, slots=True)
+class Reference:
+    id: str
+    category: str
+    title: str
+    description: str
+    url: str
+
+
+# ==================== LAYOUT ====================
+@dataclass(frozen=True, slots=True)
+class Box:
+    kind: str  # "info" | "warning" | "success" | "critical"
+    parts: tuple  # ("h", level, text, style) | ("p", text, style) | ("fact", icon, label, value) | ("ul", items)
+
+
+@dataclass(frozen=True, slots=True)
+class Card:
+    title: str
+    details: tuple  # plain strings, (label, value) pairs or ("badge", text, color)
+    badge: tuple | None = None  # (text, color)
+    accent: str | None = None
+    outline: bool = False
+    source: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Cards:
+    cards: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Section:
+    name: str
+    option: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TabSpec:
+    key: str
+    label: str
+    header: str
+    blocks: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Monograph:
+    version: str
+    drug: DrugInfo
+    strengths: tuple
+    dosing: Dosing
+    pharmacokinetics: tuple
+    contraindications: tuple
+    adverse_reactions: tuple
+    interactions: tuple
+    comparison: tuple
+    references: tuple
+    tabs: tuple
+
+
+# ==================== LOADER ====================
+SECTIONS = {
+    "strengths": None,
+    "adult_dosing": None,
+    "pediatric_dosing": None,
+    "dose_adjustments": {"renal", "hepatic"},
+    "pharmacokinetics": None,
+    "contraindications": None,
+    "adverse_reactions": None,
+    "interactions": {"contraindicated", "monitor", "transporter", "safe"},
+    "comparison": None,
+    "references": {"regulatory", "trials", "pharmacology", "guidelines"},
+}
+# Monograph fields each section is rendered from (see pharmacode.templates.SECTION_CARDS)
+SECTION_SOURCES = {
+    "strengths": ("strengths",),
+    "adult_dosing": ("drug", "dosing"),
+    "pediatric_dosing": ("dosing",),
+    "dose_adjustments": ("dosing",),
+    "pharmacokinetics": ("pharmacokinetics",),
+    "contraindications": ("contraindications",),
+    "adverse_reactions": ("adverse_reactions",),
+    "interactions": ("interactions",),
+    "comparison": ("comparison",),
+    "references": ("references",),
+}
+BOX_KINDS = {"info", "warning", "success", "critical"}
+CALLOUT_KINDS = {"info", "success", "warning", "error"}
+BADGE_COLORS = {"red", "green", "blue", "yellow", "purple"}
+WIDGETS = {"pediatric_calculator", "interaction_checker", "pk_simulator", "reference_snapshots", "adverse_reaction_chart"}
+# Patient record fields usable in screening conditions, with their value type
+PATIENT_FIELDS = {
+    "age_years": float,
+    "weight_kg": float,
+    "egfr": float,
+    "child_pugh": str,  # "A" | "B" | "C", or "none" without liver disease
+    "pregnant": bool,
+    "diabetes": bool,
+    "prior_angioedema_acei_arb": bool,
+    "hypersensitivity": bool,
+    "on_aliskiren": bool,
+    "on_acei": bool,  # taking, or switching from, an ACE inhibitor
+    "acei_hours_since_last_dose": float,
+    "low_prior_raas_dose": bool,
+}
+OPERATORS = {"<", "<=", ">", ">=", "==", "!="}
+SEVERITIES = ("caution", "avoid", "contraindicated")  # ascending
+
+
+def _get(obj, key, kind, where, default=...):
+    if key not in obj:
+        if default is ...:
+            raise ValueError(f"{where}: missing '{key}'")
+        return default
+    value = obj[key]
+    if kind is float and isinstance(value, int) and not isinstance(value, bool):
+        value = float(value)
+    if not isinstance(value, kind):
+        raise ValueError(f"{where}.{key}: expected {kind.__name__}, got {type(value).__name__}")
+    return value
+
+
+def _opt(obj, key, kind, where):
+    value = obj.get(key)
+    return None if value is None else _get(obj, key, kind, where)
+
+
+def _choice(value, choices, where):
+    if value not in choices:
+        raise ValueError(f"{where}: {value!r} is not one of {sorted(choices)}")
+    return value
+
+
+def _records(raw, key, parse):
+    items = _get(raw, key, list, "$")
+    return tuple(parse(item, f"$.{key}[{i}]") for i, item in enumerate(items))
+
+
+def _conditions(obj, where):
+    conditions = []
+    for i, item in enumerate(_get(obj, "when", list, where, [])):
+        at = f"{where}.when[{i}]"
+        if not isinstance(item, list) or len(item) != 3:
+            raise ValueError(f"{at}: expected [field, operator, value]")
+        field, op, value = item
+        kind = PATIENT_FIELDS[_choice(field, PATIENT_FIELDS, at)]
+        _choice(op, OPERATORS, at)
+        if kind is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if not isinstance(value, kind):
+            raise ValueError(f"{at}: {value!r} is not a {kind.__name__} like {field}")
+        if kind is not float and op not in {"==", "!="}:
+            raise ValueError(f"{at}: {field} can only be compared with == or !=")
+        conditions.append(Condition(field, op, value))
+    return tuple(conditions)
+
+
+def _strength(obj, where):
+    components = _get(obj, "components", dict, where)
+    for name, mg in components.items():
+        if not isinstance(mg, (int, float)):
+            raise ValueError(f"{where}.components.{name}: expected a number")
+    return Strength(
+        components=tuple((name, float(mg)) for name, mg in components.items()),
+        form=_get(obj, "form", str, where),
+        role=_get(obj, "role", str, where),
+    )
+
+
+def _dose(obj, where):
+    tablets = _get(obj, "tablets", int, where, 1)
+    dose = Dose(_opt(obj, "mg_per_kg", float, where), _opt(obj, "strength", str, where), tablets)
+    if (dose.mg_per_kg is None) == (dose.strength is None):
+        raise ValueError(f"{where}: give exactly one of 'mg_per_kg' or 'strength'")
+    if isinstance(tablets, bool) or tablets < 1:
+        raise ValueError(f"{where}.tablets: expected a whole number >= 1, got {tablets!r}")
+    if "tablets" in obj and dose.strength is None:
+        raise ValueError(f"{where}: 'tablets' needs a 'strength'")
+    return dose
+
+
+def _dosing(obj, where, strengths):
+    known = {strength.short for strength in strengths}
+
+    def check(label, at):
+        if label is not None and label not in known:
+            raise ValueError(f"{at}: unknown strength {label!r}")
+        return label
+
+    adult = tuple(
+        Regimen(
+            step=_get(item, "step", str, f"{where}.adult[{i}]"),
+            strength=check(_get(item, "strength", str, f"{where}.adult[{i}]"), f"{where}.adult[{i}]"),
+            frequency=_get(item, "frequency", str, f"{where}.adult[{i}]"),
+            note=_get(item, "note", str, f"{where}.adult[{i}]"),
+            when=_conditions(item, f"{where}.adult[{i}]"),
+        )
+        for i, item in enumerate(_get(obj, "adult", list, where))
+    )
+    pediatric = []
+    for i, item in enumerate(_get(obj, "pediatric", list, where)):
+        at = f"{where}.pediatric[{i}]"
+        start = _dose(_get(item, "start", dict, at), f"{at}.start")
+        target = _dose(_get(item, "target", dict, at), f"{at}.target")
+        steps = tuple(_dose(step, f"{at}.steps[{j}]") for j, step in enumerate(_get(item, "steps", list, at, [])))
+        check(start.strength, f"{at}.start")
+        check(target.strength, f"{at}.target")
+        for j, step in enumerate(steps):
+            check(step.strength, f"{at}.steps[{j}]")
+        pediatric.append(PediatricBand(
+            weight=_get(item, "weight", str, at),
+            min_kg=_opt(item, "min_kg", float, at),
+            max_kg=_opt(item, "max_kg", float, at),
+            start=start,
+            target=target,
+            titration_weeks=_get(item, "titration_weeks", int, at),
+            steps=steps,
+        ))
+    adjustments = []
+    for i, item in enumerate(_get(obj, "adjustments", list, where)):
+        at = f"{where}.adjustments[{i}]"
+        adjustments.append(DoseAdjustment(
+            population=_choice(_get(item, "population", str, at), SECTIONS["dose_adjustments"], f"{at}.population"),
+            icon=_get(item, "icon", str, at),
+            title=_get(item, "title", str, at),
+            start=check(_opt(item, "start", str, at), at),
+            note=_get(item, "note", str, at),
+            when=_conditions(item, at),
+        ))
+    return Dosing(
+        frequency=_get(obj, "frequency", str, where),
+        adult=adult,
+        pediatric=tuple(pediatric),
+        adjustments=tuple(adjustments),
+        suspension_mg_per_ml=_opt(obj, "suspension_mg_per_ml", float, where),
+        pediatric_min_age_years=_opt(obj, "pediatric_min_age_years", float, where),
+    )
+
+
+def _pk(obj, where):
+    return PKProfile(
+        analyte=_get(obj, "analyte", str, where),
+        title=_get(obj, "title", str, where),
+        bioavailability=_opt(obj, "bioavailability", str, where),
+        tmax_h=_get(obj, "tmax_h", float, where),
+        half_life_h=_get(obj, "half_life_h", float, where),
+        half_life_note=_opt(obj, "half_life_note", str, where),
+        protein_binding=_get(obj, "protein_binding", str, where),
+        metabolism=_get(obj, "metabolism", str, where),
+        excretion=_get(obj, "excretion", str, where),
+        parent=_opt(obj, "parent", str, where),
+    )
+
+
+def _rule(obj, where):
+    return Rule(
+        when=_conditions(obj, where),
+        severity=_choice(_get(obj, "severity", str, where, "contraindicated"), SEVERITIES, where),
+        label=_opt(obj, "label", str, where),
+    )
+
+
+def _contraindication(obj, where):
+    return Contraindication(
+        title=_get(obj, "title", str, where),
+        risk=_get(obj, "risk", str, where),
+        action=_get(obj, "action", str, where),
+        screen=tuple(_rule(rule, f"{where}.screen[{i}]") for i, rule in enumerate(_get(obj, "screen", list, where, []))),
+    )
+
+
+def _subgroup(obj, where):
+    return Subgroup(
+        name=_get(obj, "name", str, where),
+        incidence_pct=_get(obj, "incidence_pct", float, where),
+        comparator_pct=_opt(obj, "comparator_pct", float, where),
+    )
+
+
+def _adverse(obj, where):
+    return AdverseReaction(
+        icon=_get(obj, "icon", str, where),
+        name=_get(obj, "name", str, where),
+        incidence_pct=_get(obj, "incidence_pct", float, where),
+        comparator_pct=_opt(obj, "comparator_pct", float, where),
+        badge=_choice(_get(obj, "badge", str, where), BADGE_COLORS, f"{where}.badge"),
+        note=_get(obj, "note", str, where),
+        comparator=_opt(obj, "comparator", str, where),
+        subgroups=tuple(
+            _subgroup(item, f"{where}.subgroups[{i}]") for i, item in enumerate(_get(obj, "subgroups", list, where, []))
+        ),
+        listed=_get(obj, "listed", bool, where, default=True),
+    )
+
+
+def _names(items, where):
+    if not isinstance(items, list) or not all(isinstance(name, str) and name.strip() for name in items):
+        raise ValueError(f"{where}: expected a list of names")
+    return tuple(items)
+
+
+def _interaction(obj, where):
+    return Interaction(
+        name=_get(obj, "name", str, where),
+        group=_choice(_get(obj, "group", str, where), SECTIONS["interactions"], f"{where}.group"),
+        mechanism=_opt(obj, "mechanism", str, where),
+        consequence=_opt(obj, "consequence", str, where),
+        action=_opt(obj, "action", str, where),
+        source=_opt(obj, "source", str, where),
+        note=_opt(obj, "note", str, where),
+        members=tuple(
+            (generic, _names(brands, f"{where}.members.{generic}"))
+            for generic, brands in _get(obj, "members", dict, where, {}).items()
+        ),
+        aliases=_names(_get(obj, "aliases", list, where, []), f"{where}.aliases"),
+    )
+
+
+def _comparison(obj, where):
+    return ComparisonDrug(
+        icon=_get(obj, "icon", str, where),
+        name=_get(obj, "name", str, where),
+        drug_class=_get(obj, "class", str, where),
+        use=_get(obj, "use", str, where),
+        mechanism=_get(obj, "mechanism", str, where),
+        key_toxicity=_get(obj, "key_toxicity", str, where),
+        food=_get(obj, "food", str, where),
+        efficacy=_get(obj, "efficacy", str, where),
+        featured=_get(obj, "featured", bool, where, False),
+    )
+
+
+def _reference(obj, where):
+    return Reference(
+        id=_get(obj, "id", str, where),
+        category=_choice(_get(obj, "category", str, where), SECTIONS["references"], f"{where}.category"),
+        title=_get(obj, "title", str, where),
+        description=_get(obj, "description", str, where),
+        url=_get(obj, "url", str, where),
+    )
+
+
+def _part(obj, where):
+    if "h" in obj:
+        return ("h", _get(obj, "h", int, where), _get(obj, "text", str, where), _opt(obj, "style", str, where))
+    if "p" in obj:
+        return ("p", _get(obj, "p", str, where), _opt(obj, "style", str, where))
+    if "fact" in obj:
+        fact = _get(obj, "fact", list, where)
+        if len(fact) != 3 or not all(isinstance(field, str) for field in fact):
+            raise ValueError(f"{where}.fact: expected [icon, label, value]")
+        return ("fact", *fact)
+    if "ul" in obj:
+        return ("ul", tuple(_get(obj, "ul", list, where)))
+    raise ValueError(f"{where}: unknown box part {sorted(obj)}")
+
+
+def _detail(item, where):
+    if isinstance(item, str):
+        return item
+    if isinstance(item, list) and len(item) == 2:
+        return tuple(item)
+    if isinstance(item, dict) and "badge" in item:
+        text, color = _get(item, "badge", list, where)
+        return ("badge", text, _choice(color, BADGE_COLORS, f"{where}.badge"))
+    raise ValueError(f"{where}: expected text, [label, value] or {{'badge': [text, color]}}")
+
+
+def _card(obj, where):
+    badge = _opt(obj, "badge", list, where)
+    if badge is not None:
+        _choice(badge[1], BADGE_COLORS, f"{where}.badge")
+    return Card(
+        title=_get(obj, "title", str, where),
+        details=tuple(_detail(item, f"{where}.details[{i}]") for i, item in enumerate(_get(obj, "details", list, where, []))),
+        badge=None if badge is None else tuple(badge),
+        accent=_opt(obj, "accent", str, where),
+        outline=_get(obj, "outline", bool, where, False),
+        source=_opt(obj, "source", str, where),
+    )
+
+
+def _block(obj, where):
+    if "markdown" in obj:
+        return Markdown(_get(obj, "markdown", str, where))
+    if "callout" in obj:
+        return Callout(_choice(obj["callout"], CALLOUT_KINDS, f"{where}.callout"), _get(obj, "text", str, where))
+    if "divider" in obj:
+        return Divider()
+    if "box" in obj:
+        parts = _get(obj, "parts", list, where)
+        return Box(
+            _choice(obj["box"], BOX_KINDS, f"{where}.box"),
+            tuple(_part(part, f"{where}.parts[{i}]") for i, part in enumerate(parts)),
+        )
+    if "cards" in obj:
+        cards = _get(obj, "cards", list, where)
+        return Cards(tuple(_card(card, f"{where}.cards[{i}]") for i, card in enumerate(cards)))
+    if "section" in obj:
+        name = _choice(obj["section"], SECTIONS, f"{where}.section")
+        option = _opt(obj, "option", str, where)
+        if SECTIONS[name] is not None:
+            _choice(option, SECTIONS[name], f"{where}.option")
+        return Section(name, option)
+    if "widget" in obj:
+        return Widget(_choice(obj["widget"], WIDGETS, f"{where}.widget"))
+    if "expander" in obj:
+        return Expander(_get(obj, "expander", str, where), _blocks(_get(obj, "blocks", list, where), f"{where}.blocks"))
+    if "columns" in obj:
+        columns = _get(obj, "columns", list, where)
+        return Columns(tuple(_blocks(column, f"{where}.columns[{i}]") for i, column in enumerate(columns)))
+    raise ValueError(f"{where}: unknown block {sorted(obj)}")
+
+
+def _blocks(items, where):
+    return tuple(_block(item, f"{where}[{i}]") for i, item in enumerate(items))
+
+
+def _tab(obj, where):
+    return TabSpec(
+        key=_get(obj, "key", str, where),
+        label=_get(obj, "label", str, where),
+        header=_get(obj, "header", str, where),
+        blocks=_blocks(_get(obj, "blocks", list, where), f"{where}.blocks"),
+    )
+
+
+def parse_monograph(raw):
+    """Validate a decoded monograph document and build the typed model."""
+    if _get(raw, "schema", int, "$") != SCHEMA_VERSION:
+        raise ValueError(f"$.schema: unsupported schema {raw['schema']!r}, expected {SCHEMA_VERSION}")
+    drug = _get(raw, "drug", dict, "$")
+    strengths = _records(raw, "strengths", _strength)
+    return Monograph(
+        version=_get(raw, "version", str, "$"),
+        drug=DrugInfo(**{field: _get(drug, field, str, "$.drug") for field in DrugInfo.__slots__}),
+        strengths=strengths,
+        dosing=_dosing(_get(raw, "dosing", dict, "$"), "$.dosing", strengths),
+        pharmacokinetics=_records(raw, "pharmacokinetics", _pk),
+        contraindications=_records(raw, "contraindications", _contraindication),
+        adverse_reactions=_records(raw, "adverse_reactions", _adverse),
+        interactions=_records(raw, "interactions", _interaction),
+        comparison=_records(raw, "comparison", _comparison),
+        references=_records(raw, "references", _reference),
+        tabs=_records(raw, "tabs", _tab),
+    )
+
+
+def monograph_path(key):
+    return os.path.join(MONOGRAPH_DIR, f"{key}.json")
+
+
+def available_drugs(directory=MONOGRAPH_DIR):
+    """Keys of the monographs in ``directory``, sorted."""
+    return tuple(sorted(name[:-5] for name in os.listdir(directory) if name.endswith(".json")))
+
+
+def load_monograph(path):
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    try:
+        return parse_monograph(raw)
+    except ValueError as exc:
+        raise ValueError(f"{os.path.basename(path)}: {exc}") from None
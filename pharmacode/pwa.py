@@ -0,0 +1,80 @@
+"""
+Offline support for the static export: web app manifest and service worker.
+
+    python -m pharmacode.export OUT_DIR --pwa
+
+``pharmacode.export`` calls into this module when asked for a PWA build.
+The page gets a web app manifest (name, theme colour, square icons) and
+registers ``sw.js`` (``pharmacode/scripts/sw.js``), which precaches the
+whole bundle and serves it cache-first. The worker is generated with the
+bundle's file list and a version hash over it. Fingerprinted files are
+hashed by name; ``index.html`` and the web app manifest are hashed by
+content. Any content change therefore produces a new ``sw.js``, which the
+browser picks up on its next visit and installs in the background.
+``sw.js`` and ``index.html`` must be served with revalidation (no long
+max-age); every other file of the bundle can be cached as immutable.
+"""
+
+import html
+import json
+import os
+
+from pharmacode.assets import content_digest
+
+SERVICE_WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "sw.js")
+SW_NAME = "sw.js"  # fixed: the registered worker's URL must not change between versions
+WEBMANIFEST = "manifest.webmanifest"
+CACHE_PREFIX = "pharmacode-"
+THEME_COLOR = "#0460A9"
+BACKGROUND_COLOR = "#ffffff"
+
+
+def head_html(webmanifest=WEBMANIFEST, sw_name=SW_NAME):
+    """``<head>`` tags of a PWA page; the page itself still works without JavaScript."""
+    return (
+        f'<link rel="manifest" href="{html.escape(webmanifest)}">\n'
+        f'<meta name="theme-color" content="{THEME_COLOR}">\n'
+        "<script>\n"
+        'if ("serviceWorker" in navigator) {\n'
+        '    window.addEventListener("load", function () {\n'
+        f'        navigator.serviceWorker.register({json.dumps(sw_name)}, {{ updateViaCache: "none" }});\n'
+        "    });\n"
+        "}\n"
+        "</script>\n"
+    )
+
+
+def webmanifest_json(drug, icons, url_prefix):
+    """Web app manifest of a drug's page; ``icons`` are ``pharmacode.images.Variant``s."""
+    manifest = {
+        "id": "./",
+        "name": drug.page_title,
+        "short_name": drug.brand,
+        "start_url": "./",
+        "scope": "./",
+        "display": "standalone",
+        "theme_color": THEME_COLOR,
+        "background_color": BACKGROUND_COLOR,
+        "icons": [
+            {"src": url_prefix + icon.filename, "sizes": f"{icon.width}x{icon.width}", "type": icon.mime, "purpose": "any"}
+            for icon in icons
+        ],
+    }
+    return json.dumps(manifest, indent=1, ensure_ascii=False) + "\n"
+
+
+def bundle_version(out_dir, immutable, mutable):
+    """Version hash of a bundle: fingerprinted files by name, the others by content."""
+    parts = ["\n".join(immutable).encode("utf-8")]
+    for name in mutable:
+        with open(os.path.join(out_dir, name), "rb") as f:
+            parts.append(f.read())
+    return content_digest(b"\0".join(parts))
+
+
+def service_worker_js(version, files, index="index.html", src=SERVICE_WORKER):
+    """``sw.js`` for a bundle: ``files`` (relative to the page) are precached under ``version``."""
+    with open(src, encoding="utf-8") as f:
+        script = f.read()
+    config = {"version": version, "cachePrefix": CACHE_PREFIX, "index": index, "files": list(files)}
+    return f"var CONFIG = {json.dumps(config, indent=1)};\n" + script
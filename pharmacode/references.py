@@ -0,0 +1,373 @@
+"""
+Reference registry checks and a local snapshot store of what the links say.
+
+    python -m pharmacode.references verify [--drug entresto] [--base-url http://127.0.0.1:8765 -o scratch.json] [--workers 8]
+    python -m pharmacode.references serve [--port 8765] [--root fixtures/] [--delay 0.5]
+
+The registry is the ``references`` section of a monograph. ``verify_all``
+fetches every reference URL on a thread pool, at most ``PER_HOST`` requests
+to one host at a time. Each response is recorded as a ``Snapshot``: HTTP
+status, final URL, citation metadata (``citation_*`` / Open Graph meta
+tags, as published by PubMed and most journals) and the abstract. The
+snapshots are kept in ``pharmacode/snapshots/<drug>.json``. Later runs
+send the stored ETag / Last-Modified; a 304 keeps the snapshot. When a
+link fails, its last good citation is kept and the failure is recorded
+next to it.
+
+The app shows citations and abstracts from the store, so nobody has to
+open a slow third-party page to confirm a fact. ``--base-url`` points the
+verifier at a stand-in instead of the real hosts (``https://host/path``
+becomes ``<base-url>/host/path``). Its snapshots keep the citation URLs
+and must go to a scratch store (``-o``), never to the one the app shows.
+``serve`` is such a stand-in. It serves files mirrored under ``--root``
+(``<root>/<host>/<path>``) and, for any registry URL without a file, a
+page made from the registry entry. It answers conditional requests and
+can add latency.
+"""
+
+import argparse
+import hashlib
+import html
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pharmacode.model import load_monograph, monograph_path
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots")
+WORKERS = 8
+PER_HOST = 2  # concurrent requests to one host (NCBI allows 3/s without an API key)
+TIMEOUT = 15.0  # seconds per request
+MAX_BYTES = 4 * 1024 * 1024  # response bytes read per page
+USER_AGENT = "pharmacode-reference-check/1.0"
+# Elements holding the abstract, by id (PubMed, most publishers)
+ABSTRACT_IDS = ("eng-abstract", "abstract", "Abs1")
+ABSTRACT_META = ("citation_abstract", "dc.description", "og:description", "description")
+_VOID = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+@dataclass(frozen=True, slots=True)
+class Citation:
+    title: str | None = None
+    authors: tuple = ()
+    journal: str | None = None
+    date: str | None = None
+    doi: str | None = None
+    pmid: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    url: str
+    checked_at: str  # ISO 8601, UTC
+    status: int | None  # HTTP status of the last check; None when the host could not be reached
+    final_url: str | None = None  # after redirects
+    error: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    verified_at: str | None = None  # last check that returned the page
+    citation: Citation | None = None
+    abstract: str | None = None
+
+    @property
+    def ok(self):
+        return self.status is not None and 200 <= self.status < 400
+
+
+def snapshot_path(key):
+    return os.path.join(SNAPSHOT_DIR, f"{key}.json")
+
+
+def _now():
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+# ==================== STORE ====================
+def _snapshot(obj):
+    citation = obj.get("citation")
+    if citation is not None:
+        citation = Citation(**{**citation, "authors": tuple(citation.get("authors", ()))})
+    return Snapshot(**{**obj, "citation": citation})
+
+
+def load_store(path):
+    """``{reference id: Snapshot}``; empty when there is no store yet."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {ref_id: _snapshot(obj) for ref_id, obj in raw["references"].items()}
+
+
+def save_store(path, snapshots):
+    data = {"references": {ref_id: asdict(snapshot) for ref_id, snapshot in sorted(snapshots.items())}}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, indent=1, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+
+
+# ==================== PAGE METADATA ====================
+class _PageParser(HTMLParser):
+    """Collects ``<meta>`` contents, the ``<title>`` and the text of the abstract element."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}  # lower-case name or property -> [content, ...]
+        self.title = []
+        self.abstract = []
+        self._in_title = False
+        self._abstract_depth = 0  # open elements inside the abstract element, 0 when outside
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "meta":
+            name = (attrs.get("name") or attrs.get("property") or "").lower()
+            if name and attrs.get("content"):
+                self.meta.setdefault(name, []).append(attrs["content"].strip())
+        elif tag == "title":
+            self._in_title = True
+        if self._abstract_depth:
+            self._abstract_depth += tag not in _VOID
+            if tag in ("p", "br", "h3", "h4", "div"):
+                self.abstract.append("\n")
+        elif attrs.get("id") in ABSTRACT_IDS and not self.abstract and tag not in _VOID:
+            self._abstract_depth = 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if self._abstract_depth and tag not in _VOID:
+            self._abstract_depth -= 1
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        if self._abstract_depth:
+            self._abstract_depth -= 1
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title.append(data)
+        if self._abstract_depth:
+            self.abstract.append(data)
+
+    def first(self, *names):
+        return next((self.meta[name][0] for name in names if self.meta.get(name)), None)
+
+
+def _clean(text):
+    paragraphs = (" ".join(line.split()) for line in text.split("\n"))
+    return "\n\n".join(paragraph for paragraph in paragraphs if paragraph) or None
+
+
+def parse_page(text):
+    """``(Citation, abstract)`` from an HTML page."""
+    page = _PageParser()
+    page.feed(text)
+    page.close()
+    citation = Citation(
+        title=page.first("citation_title", "dc.title", "og:title") or _clean("".join(page.title)),
+        authors=tuple(page.meta.get("citation_author", ())),
+        journal=page.first("citation_journal_title", "citation_publisher", "og:site_name"),
+        date=page.first("citation_publication_date", "citation_date", "dc.date"),
+        doi=page.first("citation_doi", "dc.identifier"),
+        pmid=page.first("citation_pmid"),
+    )
+    return citation, _clean("".join(page.abstract)) or page.first(*ABSTRACT_META)
+
+
+# ==================== VERIFIER ====================
+def stand_in_url(url, base_url):
+    """``https://host/path?query`` -> ``<base_url>/host/path?query``."""
+    parts = urllib.parse.urlsplit(url)
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{base_url.rstrip('/')}/{parts.netloc}{parts.path or '/'}{query}"
+
+
+def fetch(url, previous=None, base_url=None, timeout=TIMEOUT):
+    """Check ``url`` once; returns its new Snapshot (``previous`` supplies validators and the last good content).
+
+    Any failure (HTTP status, network, malformed response, unknown charset)
+    is recorded in the snapshot rather than raised.
+    """
+    request = urllib.request.Request(
+        stand_in_url(url, base_url) if base_url else url,
+        headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"},
+    )
+    if previous is not None and previous.etag:
+        request.add_header("If-None-Match", previous.etag)
+    if previous is not None and previous.last_modified:
+        request.add_header("If-Modified-Since", previous.last_modified)
+    kept = previous or Snapshot(url, "", None)
+    now = _now()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read(MAX_BYTES)
+            charset = response.headers.get_content_charset() or "utf-8"
+            citation, abstract = parse_page(body.decode(charset, errors="replace"))
+            return Snapshot(
+                url=url,
+                checked_at=now,
+                status=response.status,
+                final_url=url if base_url else response.geturl(),  # a stand-in's address is not a citation
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                content_hash=hashlib.sha256(body).hexdigest()[:12],
+                verified_at=now,
+                citation=citation,
+                abstract=abstract,
+            )
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and previous is not None:
+            return replace(previous, url=url, checked_at=now, verified_at=now, error=None)
+        return replace(kept, url=url, checked_at=now, status=e.code, error=f"HTTP {e.code} {e.reason}")
+    except (urllib.error.URLError, OSError) as e:
+        reason = getattr(e, "reason", e)
+        return replace(kept, url=url, checked_at=now, status=None, error=str(reason))
+    except (http.client.HTTPException, LookupError) as e:  # malformed response, unknown charset
+        return replace(kept, url=url, checked_at=now, status=None, error=f"{type(e).__name__}: {str(e).strip()}")
+
+
+def verify_all(references, store, base_url=None, workers=WORKERS, per_host=PER_HOST, timeout=TIMEOUT):
+    """Check every reference concurrently; returns the updated ``{id: Snapshot}`` (``store`` is not modified)."""
+    limits = {}
+    limits_lock = threading.Lock()
+
+    def check(reference):
+        host = urllib.parse.urlsplit(reference.url).netloc
+        with limits_lock:
+            limit = limits.setdefault(host, threading.BoundedSemaphore(per_host))
+        with limit:
+            return reference.id, fetch(reference.url, store.get(reference.id), base_url, timeout)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        checked = dict(pool.map(check, references))
+    return {**store, **checked}
+
+
+# ==================== STAND-IN ====================
+STAND_IN_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<meta name="citation_title" content="{title}">
+<meta name="description" content="{description}">
+</head>
+<body>
+<h1>{title}</h1>
+<div id="abstract"><p>{description}</p></div>
+</body>
+</html>
+"""
+
+
+def stand_in_pages(references):
+    """``{"/host/path?query": page}`` made from the registry entries."""
+    pages = {}
+    for reference in references:
+        path = stand_in_url(reference.url, "")
+        pages[path] = STAND_IN_PAGE.format(
+            title=html.escape(reference.title), description=html.escape(reference.description)
+        ).encode("utf-8")
+    return pages
+
+
+def stand_in_server(references, port=0, root=None, delay=0.0, host="127.0.0.1"):
+    """An HTTP stand-in for the reference hosts; call ``serve_forever`` (or run it in a thread)."""
+    pages = stand_in_pages(references)
+    root = os.path.abspath(root) if root is not None else None
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if delay:
+                time.sleep(delay)
+            body = pages.get(self.path)
+            if root is not None:
+                path = urllib.parse.urlsplit(self.path).path
+                file = os.path.normpath(os.path.join(root, urllib.parse.unquote(path).lstrip("/")))
+                if os.path.isdir(file):
+                    file = os.path.join(file, "index.html")
+                if file.startswith(root + os.sep) and os.path.isfile(file):
+                    with open(file, "rb") as f:
+                        body = f.read()
+            if body is None:
+                self.send_error(404)
+                return
+            etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify a drug monograph's reference links and snapshot them.")
+    parser.add_argument("--drug", default="entresto", help="monograph key (pharmacode/monographs/<key>.json)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    verify = commands.add_parser("verify", help="check every reference and update the snapshot store")
+    verify.add_argument("--base-url", help="send requests to this stand-in instead of the real hosts")
+    verify.add_argument("--workers", type=int, default=WORKERS)
+    verify.add_argument("--timeout", type=float, default=TIMEOUT)
+    verify.add_argument("-o", "--output", help="snapshot store to update (default: pharmacode/snapshots/<drug>.json)")
+    serve = commands.add_parser("serve", help="run a local stand-in for the reference hosts")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--root", help="directory of mirrored pages: <root>/<host>/<path>")
+    serve.add_argument("--delay", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args(argv)
+
+    references = load_monograph(monograph_path(args.drug)).references
+    if args.command == "serve":
+        server = stand_in_server(references, args.port, args.root, args.delay)
+        print(f"Serving {len(references)} references on http://127.0.0.1:{server.server_address[1]}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.base_url and not args.output:
+        parser.error("--base-url needs -o/--output: stand-in snapshots must not replace the verified store")
+    path = args.output or snapshot_path(args.drug)
+    started = time.perf_counter()
+    snapshots = verify_all(references, load_store(path), args.base_url, args.workers, timeout=args.timeout)
+    save_store(path, snapshots)
+    out = sys.stdout
+    out.write("id\tstatus\tfinal_url\terror\n")
+    for reference in references:
+        snapshot = snapshots[reference.id]
+        out.write(f"{reference.id}\t{snapshot.status or '-'}\t{snapshot.final_url or ''}\t{snapshot.error or ''}\n")
+    failed = sum(not snapshots[reference.id].ok for reference in references)
+    print(f"{len(references)} references, {failed} failing, {time.perf_counter() - started:.1f} s -> {path}", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Declarative page blocks and the render cache for the tab content.
+
+Tab bodies are described as immutable block trees instead of sequences of
+Streamlit calls. ``prepare_tabs`` cleans every text block once (the same
+dedent/strip Streamlit applies on each ``st.markdown`` call) and merges
+consecutive HTML blocks, so a rerun only replays ready-made strings.
+"""
+
+import textwrap
+from dataclasses import dataclass
+
+
+# ==================== BLOCKS ====================
+@dataclass(frozen=True, slots=True)
+class Header:
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class Markdown:
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class Html:
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class Callout:
+    kind: str  # "info" | "success" | "warning" | "error"
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class Divider:
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Expander:
+    label: str
+    blocks: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Columns:
+    columns: tuple  # one tuple of blocks per column
+
+
+@dataclass(frozen=True, slots=True)
+class Widget:
+    name: str  # interactive element supplied by the app (see pharmacode.ui.render_blocks)
+
+
+@dataclass(frozen=True, slots=True)
+class Tab:
+    key: str
+    label: str
+    blocks: tuple
+
+
+# ==================== RENDER CACHE ====================
+def _clean(text):
+    return textwrap.dedent(text).strip()
+
+
+def prepare_blocks(blocks):
+    """Return ``blocks`` with cleaned text and adjacent ``Html`` blocks merged."""
+    prepared = []
+    for block in blocks:
+        if isinstance(block, Html):
+            text = _clean(block.text)
+            if prepared and isinstance(prepared[-1], Html):
+                # A blank line keeps each fragment its own HTML block in markdown
+                text = prepared[-1].text + "\n\n" + text
+                prepared.pop()
+            block = Html(text)
+        elif isinstance(block, Markdown):
+            block = Markdown(_clean(block.text))
+        elif isinstance(block, Callout):
+            block = Callout(block.kind, _clean(block.text))
+        elif isinstance(block, Expander):
+            block = Expander(block.label, prepare_blocks(block.blocks))
+        elif isinstance(block, Columns):
+            block = Columns(tuple(prepare_blocks(column) for column in block.columns))
+        prepared.append(block)
+    return tuple(prepared)
+
+
+def prepare_tabs(tabs):
+    return tuple(Tab(tab.key, tab.label, prepare_blocks(tab.blocks)) for tab in tabs)
+
+
+def count_elements(blocks):
+    """Number of Streamlit elements emitted for ``blocks`` (containers included)."""
+    total = 0
+    for block in blocks:
+        total += 1
+        if isinstance(block, Expander):
+            total += count_elements(block.blocks)
+        elif isinstance(block, Columns):
+            total += sum(count_elements(column) for column in block.columns)
+    return total
@@ -0,0 +1,117 @@
+"""
+Adverse-reaction incidence as a columnar dataset, with comparison chart specs.
+
+    python -m pharmacode.safety [--drug entresto] [--specs DIR]
+
+``incidence_table`` flattens the monograph's adverse reactions into one row
+per (reaction, subgroup, arm). Each column is a plain array, which charts,
+CSV export and filters all use directly. ``chart_specs`` builds one
+Vega-Lite grouped bar chart (the drug against its comparator) per subgroup
+from that table. The specs have their data inline and are plain JSON
+values: the app builds them once per content version. Switching subgroup
+only picks another prebuilt spec, and ``--specs`` writes them out as
+static files.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+import pandas as pd
+
+from pharmacode.model import load_monograph, monograph_path
+
+OVERALL = "Overall"
+COLUMNS = ("reaction", "subgroup", "arm", "incidence_pct", "rank")
+ARM_COLORS = ("#0460A9", "#94a3b8")  # drug, comparator
+BAR_HEIGHT = 14  # px per bar; the chart grows with the number of reactions
+
+
+def incidence_table(monograph):
+    """Columnar incidence rows; ``rank`` orders reactions by the drug's overall incidence."""
+    brand = monograph.drug.brand
+    ranked = sorted(monograph.adverse_reactions, key=lambda reaction: -reaction.incidence_pct)
+    columns = {name: [] for name in COLUMNS}
+
+    def add(rank, reaction, subgroup, drug_pct, comparator_pct):
+        for arm, pct in ((brand, drug_pct), (reaction.comparator, comparator_pct)):
+            if arm is None or pct is None:
+                continue
+            for name, value in zip(COLUMNS, (reaction.name, subgroup, arm, pct, rank)):
+                columns[name].append(value)
+
+    for rank, reaction in enumerate(ranked):
+        add(rank, reaction, OVERALL, reaction.incidence_pct, reaction.comparator_pct)
+        for subgroup in reaction.subgroups:
+            add(rank, reaction, subgroup.name, subgroup.incidence_pct, subgroup.comparator_pct)
+    frame = pd.DataFrame(columns)
+    for name in ("reaction", "subgroup", "arm"):
+        frame[name] = frame[name].astype("category")
+    return frame
+
+
+def subgroups(table):
+    """``Overall`` first, then the subgroups in order of appearance."""
+    names = list(dict.fromkeys(table["subgroup"].astype(str)))
+    return tuple(sorted(names, key=lambda name: name != OVERALL))
+
+
+def chart_spec(table, subgroup, title=None):
+    """Vega-Lite grouped bars of ``subgroup``'s rows, drug against comparator per reaction."""
+    rows = table[table["subgroup"] == subgroup].sort_values("rank", kind="stable")
+    arms = list(dict.fromkeys(rows["arm"].astype(str)))
+    reactions = list(dict.fromkeys(rows["reaction"].astype(str)))
+    values = [
+        {"reaction": reaction, "arm": arm, "incidence_pct": float(pct)}
+        for reaction, arm, pct in zip(rows["reaction"].astype(str), rows["arm"].astype(str), rows["incidence_pct"])
+    ]
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "title": title or f"Incidence (%), {'all patients' if subgroup == OVERALL else subgroup}",
+        "data": {"values": values},
+        "height": {"step": BAR_HEIGHT},
+        "mark": {"type": "bar", "cornerRadiusEnd": 3, "tooltip": True},
+        "encoding": {
+            "y": {"field": "reaction", "type": "nominal", "sort": reactions, "title": None},
+            "yOffset": {"field": "arm", "sort": arms},
+            "x": {"field": "incidence_pct", "type": "quantitative", "title": "Patients (%)"},
+            "color": {
+                "field": "arm",
+                "type": "nominal",
+                "sort": arms,
+                "scale": {"domain": arms, "range": list(ARM_COLORS[: len(arms)])},
+                "legend": {"orient": "bottom", "title": None},
+            },
+        },
+    }
+
+
+def chart_specs(monograph):
+    """``{subgroup: spec}`` for every subgroup of the dataset, ``Overall`` first."""
+    table = incidence_table(monograph)
+    return {subgroup: chart_spec(table, subgroup) for subgroup in subgroups(table)}
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print a drug monograph's adverse-reaction dataset as CSV.")
+    parser.add_argument("--drug", default="entresto", help="monograph key (pharmacode/monographs/<key>.json)")
+    parser.add_argument("--specs", help="also write the Vega-Lite chart specs here, one <subgroup>.json each")
+    args = parser.parse_args(argv)
+
+    monograph = load_monograph(monograph_path(args.drug))
+    incidence_table(monograph).to_csv(sys.stdout, index=False)
+    if args.specs:
+        os.makedirs(args.specs, exist_ok=True)
+        for subgroup, spec in chart_specs(monograph).items():
+            with open(os.path.join(args.specs, f"{_slug(subgroup)}.json"), "w", encoding="utf-8") as f:
+                f.write(json.dumps(spec, indent=1, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Batch patient screening against a monograph's contraindications and dosing.
+
+    python -m pharmacode.screening patients.csv [-o screened.csv] [--drug entresto]
+
+``compile_screen`` collects the machine-readable conditions of the
+monograph (contraindication ``screen`` rules, dose-adjustment and regimen
+``when`` clauses, the pediatric dose table) once. ``screen`` then evaluates
+a whole patient table column-wise: every condition is one vectorized
+comparison, so thousands of records take milliseconds.
+
+Patient columns are the ``PATIENT_FIELDS`` of ``pharmacode.model``; any may
+be missing or blank, and a condition on an unknown value does not match.
+Blank means unknown, not "no" or normal: a row that leaves blank a field
+the checks need cannot be cleared, so it is flagged "caution" as an
+incomplete record and gets no starting dose. The checks need every yes/no
+field they test, and a measurement or class wherever the yes/no conditions
+of its check hold. So ``acei_hours_since_last_dose`` is only needed when
+``on_acei`` is yes (taking, or switching from, an ACE inhibitor); record
+no liver disease as ``child_pugh`` "none". Rows without ``age_years`` are
+treated as adults. Reading Parquet needs pandas' optional pyarrow (or fastparquet)
+engine.
+"""
+
+import argparse
+import operator
+import os
+import re
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from pharmacode.dosing import build_dose_table, pediatric_doses
+from pharmacode.model import PATIENT_FIELDS, SEVERITIES, load_monograph, monograph_path
+
+ADULT_AGE_YEARS = 18
+FLAG_WORD_BITS = 63  # rule flags per int64 word of a _Flags mask, sign bit unused
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq, "!=": operator.ne}
+_TRUE = {"true", "yes", "y", "1"}
+_FALSE = {"false", "no", "n", "0"}
+
+
+@dataclass(frozen=True, slots=True)
+class Check:
+    key: str  # flag column suffix
+    label: str
+    severity: str | None  # None: informational (a dose adjustment with a starting dose)
+    when: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Screen:
+    frequency: str
+    default_start: tuple  # (strength label, total mg)
+    starts: tuple  # ((when, strength label, total mg, from a dose adjustment), ...) lower starting doses
+    checks: tuple
+    required: tuple  # ((field, (gate conditions, ...)), ...): needed on rows matching any gate; () gate: every row
+    dose_table: object
+    pediatric_min_age_years: float | None
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+def compile_screen(monograph):
+    totals = {s.short: sum(mg for _, mg in s.components) for s in monograph.strengths}
+    dosing = monograph.dosing
+    checks = []
+    for item in monograph.contraindications:
+        for i, rule in enumerate(item.screen):
+            suffix = f"_{i + 1}" if len(item.screen) > 1 else ""
+            label = rule.label or (item.title if rule.severity == "contraindicated" else f"{item.title} ({rule.severity})")
+            checks.append(Check(_slug(item.title) + suffix, label, rule.severity, rule.when))
+    starts = []
+    for adjustment in dosing.adjustments:
+        if not adjustment.when:
+            continue
+        severity = None if adjustment.start else "avoid"
+        note = f"start {adjustment.start}" if adjustment.start else "not recommended"
+        checks.append(Check(_slug(f"{adjustment.population} {adjustment.title}"), f"{adjustment.title}: {note}", severity, adjustment.when))
+        if adjustment.start:
+            starts.append((adjustment.when, adjustment.start, totals[adjustment.start], True))
+    starts.extend((regimen.when, regimen.strength, totals[regimen.strength], False) for regimen in dosing.adult if regimen.when)
+    default = next(regimen.strength for regimen in dosing.adult if not regimen.when)
+    # Fields the checks need: yes/no fields on every row, the others where their check's yes/no conditions
+    # hold (washout hours for ACEi patients only); age and weight are handled by the dosing
+    required = {}
+    for check in checks:
+        gate = tuple(condition for condition in check.when if PATIENT_FIELDS[condition.field] is bool)
+        for condition in check.when:
+            if condition.field not in ("age_years", "weight_kg"):
+                required.setdefault(condition.field, {})[() if condition in gate else gate] = None
+    return Screen(
+        frequency=dosing.frequency,
+        default_start=(default, totals[default]),
+        starts=tuple(starts),
+        checks=tuple(checks),
+        required=tuple((field, tuple(gates)) for field, gates in required.items()),
+        dose_table=build_dose_table(monograph) if dosing.pediatric else None,
+        pediatric_min_age_years=dosing.pediatric_min_age_years,
+    )
+
+
+# ==================== INPUT ====================
+def _as_bool(column):
+    if column.dtype == bool:
+        return column
+    text = column.astype("string").str.strip().str.lower()
+    return pd.Series(
+        np.select([text.isin(_TRUE).fillna(False), text.isin(_FALSE).fillna(False)], [True, False], None),
+        index=column.index,
+        dtype="boolean",
+    )
+
+
+def normalize_patients(frame):
+    """Coerce the known patient columns to their types; unparseable values become missing."""
+    frame = frame.copy()
+    for field, kind in PATIENT_FIELDS.items():
+        if field not in frame:
+            continue
+        if kind is float:
+            frame[field] = pd.to_numeric(frame[field], errors="coerce")
+        elif kind is bool:
+            frame[field] = _as_bool(frame[field])
+        else:
+            frame[field] = frame[field].astype("string").str.strip().str.upper()
+    return frame
+
+
+def read_patients(path):
+    if os.path.splitext(path)[1].lower() in {".parquet", ".pq"}:
+        return normalize_patients(pd.read_parquet(path))
+    return normalize_patients(pd.read_csv(path))
+
+
+# ==================== SCREENING ====================
+def _matches(frame, when):
+    mask = np.ones(len(frame), dtype=bool)
+    for condition in when:
+        if condition.field not in frame:
+            return np.zeros(len(frame), dtype=bool)
+        value = condition.value.upper() if isinstance(condition.value, str) else condition.value
+        result = OPERATORS[condition.op](frame[condition.field], value)
+        mask &= result.fillna(False).to_numpy(dtype=bool)
+    return mask
+
+
+def _numbers(frame, field):
+    if field not in frame:
+        return np.full(len(frame), np.nan)
+    return frame[field].to_numpy(dtype=float, na_value=np.nan)
+
+
+def _blank(frame, field):
+    if field not in frame:
+        return np.ones(len(frame), dtype=bool)
+    return frame[field].isna().to_numpy(dtype=bool) | (frame[field].astype("string") == "").fillna(True).to_numpy(dtype=bool)
+
+
+class _Flags:
+    """Matched rule labels per row, kept as bit masks and joined once per distinct combination.
+
+    Each int64 word holds ``FLAG_WORD_BITS`` rules; a word is added for every
+    further ``FLAG_WORD_BITS``, so any number of rules fit.
+    """
+
+    def __init__(self, n):
+        self.labels = []
+        self.words = [np.zeros(n, dtype=np.int64)]
+
+    def add(self, mask, label):
+        word, bit = divmod(len(self.labels), FLAG_WORD_BITS)
+        if word == len(self.words):
+            self.words.append(np.zeros_like(self.words[0]))
+        self.words[word] |= mask.astype(np.int64) << bit
+        self.labels.append(label)
+
+    def text(self):
+        codes, rows = np.unique(np.stack(self.words, axis=1), axis=0, return_inverse=True)
+        joined = [
+            "; ".join(
+                label for i, label in enumerate(self.labels)
+                if code[i // FLAG_WORD_BITS] >> (i % FLAG_WORD_BITS) & 1
+            )
+            for code in codes
+        ]
+        return np.array(joined, dtype=object)[rows.reshape(-1)]
+
+
+def screen(rules, patients):
+    """Screen a normalized patient table; returns it with the result columns appended.
+
+    ``status`` is the most severe flag ("ok", "caution", "avoid",
+    "contraindicated"); ``start_dose`` / ``start_mg`` the starting dose
+    (blank when the drug should not be started, or the dose or an
+    incomplete record needs review);
+    ``flags`` the matched rules and ``flag_<rule>`` one boolean column per rule.
+    """
+    n = len(patients)
+    severity = np.zeros(n, dtype=int)  # index into ("ok",) + SEVERITIES
+    flags = _Flags(n)
+    columns = {}
+    for check in rules.checks:
+        hit = _matches(patients, check.when)
+        columns[f"flag_{check.key}"] = hit
+        if check.severity:
+            severity = np.where(hit, np.maximum(severity, SEVERITIES.index(check.severity) + 1), severity)
+        flags.add(hit, check.label)
+
+    strength, total = rules.default_start
+    start = np.full(n, f"{strength} mg {rules.frequency}", dtype=object)
+    mg = np.full(n, total)
+    for when, strength, total, _ in rules.starts:
+        lower = _matches(patients, when) & (total < mg)
+        start[lower] = f"{strength} mg {rules.frequency}"
+        mg[lower] = total
+
+    # Weight-based dosing below adult age; adult adjustments do not carry over
+    age = _numbers(patients, "age_years")
+    pediatric = age < ADULT_AGE_YEARS
+    if pediatric.any() and rules.dose_table is not None:
+        child_mg = pediatric_doses(rules.dose_table, _numbers(patients, "weight_kg"))["mg"][:, 0]
+        adjusted = np.zeros(n, dtype=bool)
+        for when, _, _, adjustment in rules.starts:
+            if adjustment:
+                adjusted |= _matches(patients, when)
+        min_age = rules.pediatric_min_age_years or 0.0
+        too_young = pediatric & (age < min_age)
+        no_weight = pediatric & ~too_young & np.isnan(child_mg)
+        adjusted &= pediatric & ~too_young & ~no_weight
+        flags.add(too_young, f"Pediatric dosing not established below age {min_age:g}")
+        flags.add(no_weight, "Pediatric dose needs a weight in a dosing band")
+        flags.add(adjusted, "Pediatric dose adjustment not covered; review")
+        review = too_young | no_weight | adjusted
+        severity = np.where(review, np.maximum(severity, SEVERITIES.index("caution") + 1), severity)
+        dosed = pediatric & ~review
+        start[pediatric] = ""
+        start[dosed] = [f"{x:g} mg {rules.frequency}" for x in np.round(child_mg[dosed], 1)]
+        mg = np.where(pediatric, np.where(dosed, child_mg, np.nan), mg)
+
+    # Missing is not normal: a row the checks could not clear is reviewed, not dosed
+    incomplete = np.zeros(n, dtype=bool)
+    for field, gates in rules.required:
+        needed = np.zeros(n, dtype=bool)
+        for gate in gates:
+            needed |= _matches(patients, gate)
+        missing = needed & _blank(patients, field)
+        flags.add(missing, f"Incomplete record: no {field}")
+        incomplete |= missing
+    severity = np.where(incomplete, np.maximum(severity, SEVERITIES.index("caution") + 1), severity)
+    start[incomplete] = ""
+    mg[incomplete] = np.nan
+
+    blocked = severity >= SEVERITIES.index("avoid") + 1
+    start[blocked] = ""
+    mg[blocked] = np.nan
+    columns["status"] = np.array(("ok",) + SEVERITIES, dtype=object)[severity]
+    columns["start_dose"] = start
+    columns["start_mg"] = mg
+    columns["flags"] = flags.text()
+    return pd.concat([patients, pd.DataFrame(columns, index=patients.index)], axis=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a patient list (CSV or Parquet) against a drug monograph.")
+    parser.add_argument("patients")
+    parser.add_argument("-o", "--output", help="write the screened table here (.csv or .parquet); default: stdout as CSV")
+    parser.add_argument("--drug", default="entresto", help="monograph key (pharmacode/monographs/<key>.json)")
+    args = parser.parse_args(argv)
+
+    result = screen(compile_screen(load_monograph(monograph_path(args.drug))), read_patients(args.patients))
+    if args.output and os.path.splitext(args.output)[1].lower() in {".parquet", ".pq"}:
+        result.to_parquet(args.output, index=False)
+    else:
+        result.to_csv(args.output or sys.stdout, index=False)
+    counts = result["status"].value_counts()
+    print(", ".join(f"{status}: {counts.get(status, 0)}" for status in ("ok",) + SEVERITIES), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+/*
+ * Google Analytics tracker for the drug apps.
+ * Runs in the app page itself (not in a component iframe): pharmacode.analytics
+ * injects it once per browser session with its settings in data-* attributes.
+ * data-app-name is read at send time: switching drugs in the page only updates it.
+ *
+ * Listeners only enqueue events; the queue is flushed to gtag (beacon
+ * transport) on an interval, when it fills up, and when the page is hidden,
+ * so tracking stays off the main thread's hot paths on low-end phones.
+ */
+(function () {
+    var config = document.currentScript.dataset;
+    var GA_ID = config.gaId;
+    var APP_NAME = config.appName;
+    var SAMPLE_RATE = parseFloat(config.sampleRate || '1');
+    var FLUSH_INTERVAL_MS = parseInt(config.flushInterval || '10000', 10);
+    var MAX_QUEUE = 20;
+    var HEARTBEAT_SECONDS = 30;
+
+    // 1. منع تكرار الـ Event Listeners و Heartbeat
+    var guard = '_gaListenersAttached_' + GA_ID.replace('-', '_');
+    if (window[guard]) {
+        return;
+    }
+    window[guard] = true;
+
+    // Sampling is decided once per browser session so a visit is tracked whole or not at all
+    var sampled = sessionStorage.getItem(guard);
+    if (sampled === null) {
+        sampled = Math.random() < SAMPLE_RATE ? '1' : '0';
+        sessionStorage.setItem(guard, sampled);
+    }
+    if (sampled !== '1') {
+        return;
+    }
+
+    // 2. منع حقن السكربت أكثر من مرة
+    if (!document.querySelector('script[src*="googletagmanager.com/gtag/js?id=' + GA_ID + '"]')) {
+        var script = document.createElement('script');
+        script.src = "https://www.googletagmanager.com/gtag/js?id=" + GA_ID;
+        script.async = true;
+        document.head.appendChild(script);
+
+        window.dataLayer = window.dataLayer || [];
+        window.gtag = function () { window.dataLayer.push(arguments); };
+        window.gtag('js', new Date());
+        window.gtag('config', GA_ID, { 'app_name': APP_NAME, 'transport_type': 'beacon' });
+    }
+
+    // ==================== EVENT QUEUE ====================
+    var queue = [];
+    var flushScheduled = false;
+
+    function flush() {
+        flushScheduled = false;
+        var events = queue;
+        queue = [];
+        for (var i = 0; i < events.length; i++) {
+            events[i][1].app_name = config.appName;
+            events[i][1].transport_type = 'beacon';
+            window.gtag('event', events[i][0], events[i][1]);
+        }
+    }
+
+    function scheduleFlush() {
+        if (flushScheduled) {
+            return;
+        }
+        flushScheduled = true;
+        (window.requestIdleCallback || function (fn) { return setTimeout(fn, 0); })(flush);
+    }
+
+    function track(name, params) {
+        queue.push([name, params]);
+        if (queue.length >= MAX_QUEUE) {
+            scheduleFlush();
+        }
+    }
+
+    setInterval(function () {
+        if (queue.length) {
+            scheduleFlush();
+        }
+    }, FLUSH_INTERVAL_MS);
+
+    // متغيرات التتبع
+    var _gaStartTime = Date.now();
+    var _gaElapsedSeconds = 0;
+    var _gaScrollTracked = {};
+    var _gaFirstTabTracked = false;
+    var _gaLastTab = 'Overview';
+    var _gaExitSent = false;
+
+    // تتبع حدث الخروج من الصفحة + تفريغ الطابور عند إخفاء الصفحة
+    document.addEventListener('visibilitychange', function () {
+        if (document.visibilityState === 'hidden') {
+            flush();
+        }
+    });
+    window.addEventListener('pagehide', function () {
+        if (!_gaExitSent) {
+            _gaExitSent = true;
+            track('page_exit', {
+                'total_time_seconds': Math.round((Date.now() - _gaStartTime) / 1000),
+                'last_tab': _gaLastTab
+            });
+        }
+        flush();
+    });
+
+    setTimeout(function () {
+
+        // تتبع النقرات (التبويبات، الأزرار، القوائم المطوية، الروابط الخارجية)
+        document.addEventListener('click', function (event) {
+            try {
+                const tab = event.target.closest('[data-baseweb="tab"]');
+                const button = event.target.closest('button');
+                const expander = event.target.closest('summary');
+                const link = event.target.closest('a');
+
+                if (tab && tab.innerText) {
+                    var tabName = tab.innerText.trim();
+                    _gaLastTab = tabName;
+                    track('tab_click', { 'tab_name': tabName });
+                    // تتبع أول تبويب يفتحه المستخدم
+                    if (!_gaFirstTabTracked) {
+                        _gaFirstTabTracked = true;
+                        track('first_tab_click', { 'tab_name': tabName });
+                    }
+                } else if (button && button.innerText) {
+                    track('button_click', { 'button_name': button.innerText.trim() });
+                } else if (expander && expander.innerText) {
+                    track('expander_click', { 'section_name': expander.innerText.trim() });
+                } else if (link && link.href && !link.href.includes(window.location.hostname)) {
+                    // Outbound navigation may unload the page: send right away
+                    track('outbound_link', { 'link_url': link.href });
+                    flush();
+                }
+            } catch (e) { console.log("Tracking error", e); }
+        }, { passive: true });
+
+        // تتبع عمليات نسخ النصوص مع المحتوى المنسوخ
+        document.addEventListener('copy', function () {
+            var selectedText = 'unknown';
+            try {
+                selectedText = document.getSelection().toString().substring(0, 100);
+            } catch (e) { /* keep 'unknown' */ }
+            track('text_copied', { 'copied_text': selectedText });
+        }, { passive: true });
+
+        // تتبع عمق التمرير (Scroll Depth) - passive listener, measured at most once per frame
+        var scrollTarget = document.querySelector('[data-testid="stAppViewContainer"]') || document.documentElement;
+        var scrollSource = scrollTarget === document.documentElement ? window : scrollTarget;
+        var thresholds = [25, 50, 75, 100];
+        var frameRequested = false;
+
+        function measureScroll() {
+            frameRequested = false;
+            try {
+                var el = scrollTarget;
+                var scrollPercent = Math.round((el.scrollTop / (el.scrollHeight - el.clientHeight)) * 100);
+                thresholds.forEach(function (threshold) {
+                    if (scrollPercent >= threshold && !_gaScrollTracked[threshold]) {
+                        _gaScrollTracked[threshold] = true;
+                        track('scroll_depth', { 'percent': threshold });
+                    }
+                });
+                if (_gaScrollTracked[100]) {
+                    scrollSource.removeEventListener('scroll', onScroll);
+                }
+            } catch (e) { console.log("Scroll tracking error", e); }
+        }
+
+        function onScroll() {
+            if (!frameRequested) {
+                frameRequested = true;
+                window.requestAnimationFrame(measureScroll);
+            }
+        }
+        scrollSource.addEventListener('scroll', onScroll, { passive: true });
+
+        // نبض التفاعل مع الوقت التراكمي (Engagement Heartbeat) - paused while the page is hidden
+        setInterval(function () {
+            if (!document.hidden) {
+                _gaElapsedSeconds += HEARTBEAT_SECONDS;
+                track('heartbeat', {
+                    'interval': HEARTBEAT_SECONDS + '_seconds',
+                    'total_time_seconds': _gaElapsedSeconds
+                });
+            }
+        }, HEARTBEAT_SECONDS * 1000);
+
+    }, 2000);
+})();
@@ -0,0 +1,62 @@
+/*
+ * Service worker of the offline static export.
+ * pharmacode.pwa writes it next to index.html as sw.js, with a CONFIG object
+ * (bundle version and file list) prepended.
+ *
+ * Every file of a bundle version is precached on install and served
+ * cache-first: repeat visits need no network at all. Nothing is revalidated
+ * file by file; the browser re-fetches sw.js itself on navigation, and a
+ * new content version is a new sw.js. That worker precaches the new bundle
+ * in the background beside the old one, then takes over and drops the old
+ * cache, so index.html and the fingerprinted files it names always come
+ * from the same version.
+ */
+(function () {
+    var CACHE = CONFIG.cachePrefix + CONFIG.version;
+    var scope = self.registration.scope;
+    var index = new URL(CONFIG.index, scope).href;
+
+    self.addEventListener('install', function (event) {
+        event.waitUntil(
+            caches.open(CACHE).then(function (cache) {
+                // Bypass the HTTP cache: an unversioned file there may belong to the previous bundle
+                return cache.addAll(CONFIG.files.map(function (file) {
+                    return new Request(new URL(file, scope).href, { cache: 'reload' });
+                }));
+            }).then(function () {
+                return self.skipWaiting();
+            })
+        );
+    });
+
+    self.addEventListener('activate', function (event) {
+        event.waitUntil(
+            caches.keys().then(function (names) {
+                return Promise.all(names.filter(function (name) {
+                    return name.indexOf(CONFIG.cachePrefix) === 0 && name !== CACHE;
+                }).map(function (name) {
+                    return caches.delete(name);
+                }));
+            }).then(function () {
+                return self.clients.claim();
+            })
+        );
+    });
+
+    self.addEventListener('fetch', function (event) {
+        var request = event.request;
+        if (request.method !== 'GET' || request.url.indexOf(scope) !== 0) {
+            return;  // analytics and other origins go straight to the network
+        }
+        var url = request.url.split('#')[0].split('?')[0];
+        // The page is visited as the scope root as well as index.html
+        var key = request.mode === 'navigate' && url === scope ? index : url;
+        event.respondWith(
+            caches.open(CACHE).then(function (cache) {
+                return cache.match(key).then(function (cached) {
+                    return cached || fetch(request);
+                });
+            })
+        );
+    });
+})();
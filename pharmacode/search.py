@@ -0,0 +1,205 @@
+"""
+Full-text search over every card, box, reference and callout of the tabs.
+
+``build_index`` walks the prepared tab blocks once, splits them into
+sections (one per card/box/callout) and builds an inverted index with term
+frequencies, a sorted vocabulary for prefix lookups and a deletion index
+for typo-tolerant matching (edit distance 1, or 2 for long words).
+Queries are AND across terms and ranked by tf-idf. Each index owns its
+deletion index, so it is freed with the index it belongs to.
+"""
+
+import bisect
+import html
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+
+from pharmacode.render import Callout, Columns, Expander, Header, Html, Markdown
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_TAG = re.compile(r"<[^>]+>")
+_SECTION = re.compile(r'<div class="([\w-]+)"[^>]*>(.*?)</div>', re.S)
+_TITLE = re.compile(r"<(h[1-6]|strong)[^>]*>(.*?)</\1>", re.S)
+_MARKDOWN = re.compile(r"[*_#`>]+")
+
+EXACT, PREFIX, FUZZY = 1.0, 0.6, 0.4
+MIN_PREFIX = 2
+
+
+@dataclass(frozen=True, slots=True)
+class Section:
+    id: int
+    tab_key: str
+    tab_label: str
+    path: tuple  # expander / heading trail inside the tab
+    title: str
+    text: str
+    html: str | None  # original card markup, None for markdown callouts
+
+
+@dataclass(frozen=True, slots=True)
+class Hit:
+    section: Section
+    score: float
+    terms: tuple  # index terms that matched
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def _plain(fragment):
+    return re.sub(r"\s+", " ", html.unescape(_TAG.sub(" ", fragment))).strip()
+
+
+def _deletions(term, depth):
+    variants = {term}
+    frontier = {term}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+def _max_edits(term):
+    return 2 if len(term) >= 7 else 1 if len(term) >= 4 else 0
+
+
+def _edit_distance(a, b, limit):
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+# ==================== INDEX ====================
+class DeletionIndex:
+    """Deletion variants -> terms, for one index's vocabulary."""
+
+    def __init__(self, terms):
+        variants = defaultdict(list)
+        for term in terms:
+            for variant in _deletions(term, _max_edits(term)):
+                variants[variant].append(term)
+        self.variants = {variant: tuple(found) for variant, found in variants.items()}
+
+    def get(self, variant):
+        return self.variants.get(variant, ())
+
+
+class SearchIndex:
+    def __init__(self, sections):
+        self.sections = tuple(sections)
+        postings = defaultdict(dict)
+        for section in self.sections:
+            for term in tokenize(f"{section.title} {section.text} {' '.join(section.path)}"):
+                postings[term][section.id] = postings[term].get(section.id, 0) + 1
+        self.postings = dict(postings)
+        self.vocabulary = sorted(self.postings)
+        self.idf = {
+            term: math.log(1 + len(self.sections) / len(docs)) for term, docs in self.postings.items()
+        }
+        self.deletions = DeletionIndex(self.vocabulary)
+
+    def expand(self, token, allow_prefix=True):
+        """Index terms matching ``token``, each with its match weight."""
+        matches = {}
+        if token in self.postings:
+            matches[token] = EXACT
+        if allow_prefix and len(token) >= MIN_PREFIX:
+            # By position rather than by slice: the vocabulary may be a lazy view (pharmacode.artifact)
+            for i in range(bisect.bisect_left(self.vocabulary, token), len(self.vocabulary)):
+                term = self.vocabulary[i]
+                if not term.startswith(token):
+                    break
+                matches.setdefault(term, PREFIX)
+        if not matches:
+            limit = _max_edits(token)
+            candidates = set()
+            for variant in _deletions(token, limit):
+                candidates.update(self.deletions.get(variant))
+            for term in candidates:
+                if _edit_distance(token, term, limit) <= limit:
+                    matches.setdefault(term, FUZZY)
+        return matches
+
+    def search(self, query, limit=10):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        scores = None
+        matched = defaultdict(set)
+        for token in tokens:
+            expanded = self.expand(token)
+            token_scores = defaultdict(float)
+            for term, weight in expanded.items():
+                for doc, tf in self.postings[term].items():
+                    token_scores[doc] = max(token_scores[doc], weight * (1 + math.log(tf)) * self.idf[term])
+                    matched[doc].add(term)
+            if scores is None:
+                scores = dict(token_scores)
+            else:
+                scores = {doc: score + token_scores[doc] for doc, score in scores.items() if doc in token_scores}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [Hit(self.sections[doc], score, tuple(sorted(matched[doc]))) for doc, score in ranked]
+
+
+# ==================== SECTIONS ====================
+def _sections_from_blocks(blocks, tab, base, out):
+    trail = base
+    for block in blocks:
+        if isinstance(block, Header):
+            continue
+        if isinstance(block, Markdown):
+            # A sub-heading names the cards below it, up to the next one
+            heading = _MARKDOWN.sub("", block.text).strip()
+            trail = base + (heading,) if heading else base
+        elif isinstance(block, Html):
+            for match in _SECTION.finditer(block.text):
+                fragment = match.group(0)
+                title = _TITLE.search(match.group(2))
+                out.append((tab, trail, _plain(title.group(2)) if title else "", _plain(match.group(2)), fragment))
+        elif isinstance(block, Callout):
+            text = _MARKDOWN.sub("", block.text)
+            lines = text.strip().splitlines()
+            out.append((tab, trail, lines[0].strip() if lines else "", _plain(text), None))
+        elif isinstance(block, Expander):
+            # An expander is its own section of the tab, not part of the sub-heading above it
+            _sections_from_blocks(block.blocks, tab, base + (block.label,), out)
+        elif isinstance(block, Columns):
+            for column in block.columns:
+                _sections_from_blocks(column, tab, trail, out)
+
+
+def build_index(tabs):
+    """Index the prepared ``tabs`` (see ``pharmacode.render.prepare_tabs``)."""
+    raw = []
+    for tab in tabs:
+        _sections_from_blocks(tab.blocks, tab, (), raw)
+    sections = [
+        Section(i, tab.key, tab.label, trail, title, text, fragment)
+        for i, (tab, trail, title, text, fragment) in enumerate(raw)
+    ]
+    return SearchIndex(sections)
+
+
+def snippet(section, terms, width=160):
+    """A window of the section text around the first matched term, with matches in bold."""
+    text = section.text
+    lowered = text.lower()
+    first = min((i for i in (lowered.find(term) for term in terms) if i >= 0), default=0)
+    start = max(0, first - width // 3)
+    end = min(len(text), start + width)
+    window = text[start:end]
+    for term in sorted(terms, key=len, reverse=True):
+        window = re.sub(rf"(?i)\b({re.escape(term)}\w*)", r"**\1**", window, count=1)
+    return ("…" if start else "") + window + ("…" if end < len(text) else "")
@@ -0,0 +1,318 @@
+"""
+Compression and HTTP caching in front of the app.
+
+    python -m pharmacode.serve [--host 0.0.0.0] [--port 8501]
+    uvicorn pharmacode.serve:build_app --factory --port 8501
+
+Runs ``Entresto_app.py`` as an ``st.App`` with one extra middleware,
+``StaticFront``. It answers GET and HEAD requests for two directories
+itself:
+- ``static/`` at ``app/static/``: the fingerprinted stylesheet, tracker and
+  image variants;
+- Streamlit's frontend bundle: the page and its JavaScript, CSS and fonts.
+
+Streamlit serves both uncompressed, so that it does not gzip the same files
+again on every request. Here each file is compressed once and kept in a
+bounded in-memory cache. Brotli is used when the ``brotli`` module is
+installed, and gzip always. Each representation has a strong ETag, and a
+matching If-None-Match gets a bodiless 304. HEAD gets GET's headers,
+Content-Length included, without the body. Fingerprinted names (a content
+hash in the name) are cacheable for a year as immutable. The page and the
+manifests are revalidated on every use, which costs a 304 at most.
+
+Everything else passes through to Streamlit: the websocket, media, health
+checks, and range requests. Streamlit's own gzip middleware covers the
+dynamic responses. uvicorn's permessage-deflate compresses the websocket,
+which carries the rendered HTML blocks.
+"""
+
+import argparse
+import gzip
+import mimetypes
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.middleware import Middleware
+from starlette.responses import Response
+
+from pharmacode.assets import content_digest
+
+try:  # optional: Brotli is ~15% smaller than gzip on the JavaScript bundle
+    import brotli
+except ImportError:
+    brotli = None
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = os.path.join(APP_DIR, "Entresto_app.py")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# <stem>.<digest>.<ext> (assets.write_fingerprinted) and <stem>-<digest>-<width>.<ext> (images)
+FINGERPRINTED = re.compile(r"[.-][0-9a-f]{12}[.-]")
+# Streamlit's bundle: everything under static/ carries a build hash; index.html and manifest.json do not
+BUNDLE_HASHED = re.compile(r"^static/")
+COMPRESSIBLE = re.compile(r"^(?:text/|image/svg\+xml|font/(?:ttf|otf)|application/(?:javascript|json|manifest\+json|xml|wasm))")
+MIN_COMPRESS_SIZE = 512  # bytes; smaller bodies gain less than the headers cost
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9  # 10-11 take several seconds on the largest chunks for ~2% less
+# (content coding, ETag suffix), in order of preference
+CODINGS = (("br", "br"), ("gzip", "gz"))
+
+
+@dataclass(frozen=True, slots=True)
+class Root:
+    prefix: str  # URL path, with trailing slash
+    directory: str
+    immutable: re.Pattern  # matched against the name relative to ``directory``
+    index: str | None = None  # file served for ``prefix`` itself
+    names: frozenset | None = None  # the only names served, for a read-only directory; None: any file
+
+
+@dataclass(frozen=True, slots=True)
+class Payload:
+    mtime_ns: int
+    media_type: str
+    cache_control: str
+    bodies: dict  # content coding ("identity", "br", "gzip") -> bytes
+    etags: dict  # content coding -> quoted strong ETag
+
+    @property
+    def size(self):
+        return sum(len(body) for body in self.bodies.values())
+
+
+def compress(data, media_type):
+    """``{coding: body}`` of ``data``: identity plus every available coding that makes it smaller."""
+    bodies = {"identity": data}
+    if len(data) < MIN_COMPRESS_SIZE or not COMPRESSIBLE.match(media_type):
+        return bodies
+    candidates = {"gzip": gzip.compress(data, GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        candidates["br"] = brotli.compress(data, quality=BROTLI_QUALITY)
+    bodies.update((coding, body) for coding, body in candidates.items() if len(body) < len(data))
+    return bodies
+
+
+def load_payload(path, cache_control):
+    with open(path, "rb") as f:
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        data = f.read()
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    bodies = compress(data, media_type)
+    digest = content_digest(data)
+    etags = {"identity": f'"{digest}"'}
+    etags.update((coding, f'"{digest}-{suffix}"') for coding, suffix in CODINGS if coding in bodies)
+    return Payload(mtime_ns, media_type, cache_control, bodies, etags)
+
+
+class PayloadCache:
+    """LRU of compressed files bounded by total bytes, invalidated by mtime.
+
+    Each file is compressed by one thread; concurrent first requests for it
+    wait for that result instead of compressing it again.
+    """
+
+    def __init__(self, max_bytes=64 << 20, max_file_bytes=8 << 20, revalidate_after=2.0, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes  # larger files are left to Streamlit, uncompressed
+        self.revalidate_after = revalidate_after
+        self._clock = clock
+        self._entries = OrderedDict()  # path -> (payload, checked_at)
+        self._bytes = 0
+        self._loading = {}  # path -> lock held while that file is compressed
+        self._lock = threading.Lock()
+
+    def get(self, path, cache_control):
+        """``path``'s payload; None when it is missing, not a file or too large."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and now - entry[1] < self.revalidate_after:
+                self._entries.move_to_end(path)
+                return entry[0]
+            loading = self._loading.setdefault(path, threading.Lock())
+        with loading:
+            with self._lock:
+                entry = self._entries.get(path)
+            if entry is not None and self._clock() - entry[1] < self.revalidate_after:
+                return entry[0]  # loaded by the thread this one waited for
+            try:
+                payload = self._load(path, cache_control, entry)
+            finally:
+                with self._lock:
+                    self._loading.pop(path, None)
+            if payload is None:
+                return None
+            with self._lock:
+                old = self._entries.pop(path, None)
+                if old is not None:
+                    self._bytes -= old[0].size
+                self._entries[path] = (payload, now)
+                self._bytes += payload.size
+                while self._bytes > self.max_bytes and len(self._entries) > 1:
+                    self._bytes -= self._entries.popitem(last=False)[1][0].size
+            return payload
+
+    def _load(self, path, cache_control, entry):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path) or stat.st_size > self.max_file_bytes:
+            return None
+        if entry is not None and entry[0].mtime_ns == stat.st_mtime_ns:
+            return entry[0]
+        return load_payload(path, cache_control)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def accepted_codings(accept_encoding):
+    """Content codings an Accept-Encoding header allows (q > 0); ``*`` stands for any."""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        quality = params.strip()
+        if quality.startswith("q=") and quality[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if coding.strip():
+            accepted.add(coding.strip())
+    return accepted
+
+
+def negotiate(payload, accept_encoding):
+    accepted = accepted_codings(accept_encoding)
+    for coding, _ in CODINGS:
+        if coding in payload.bodies and (coding in accepted or "*" in accepted):
+            return coding
+    return "identity"
+
+
+def not_modified(payload, if_none_match):
+    """Whether If-None-Match names any representation of the payload's current content."""
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return not tags.isdisjoint(payload.etags.values())
+
+
+def payload_response(payload, request_headers, head=False):
+    """The response to a GET of ``payload``; with ``head``, the same headers and no body."""
+    coding = negotiate(payload, request_headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": payload.etags[coding],
+        "Cache-Control": payload.cache_control,
+        "X-Content-Type-Options": "nosniff",
+        "Access-Control-Allow-Origin": "*",
+    }
+    if len(payload.bodies) > 1:
+        headers["Vary"] = "Accept-Encoding"
+    if not_modified(payload, request_headers.get("if-none-match", "")):
+        return Response(status_code=304, headers=headers)
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    body = payload.bodies[coding]
+    if head:
+        headers["Content-Length"] = str(len(body))
+        body = b""
+    return Response(body, headers=headers, media_type=payload.media_type)
+
+
+def _safe_name(name):
+    """``name`` if it is a plain relative path inside its directory, else None."""
+    parts = name.split("/")
+    if not name or any(part in ("", ".", "..") or "\\" in part or ":" in part or "\0" in part for part in parts):
+        return None
+    return name
+
+
+class StaticFront:
+    """ASGI middleware serving ``roots`` precompressed and cacheable; all other traffic goes to ``app``."""
+
+    def __init__(self, app, roots=None, cache=None):
+        self.app = app
+        self.roots = tuple(roots) if roots is not None else default_roots()
+        self.cache = cache if cache is not None else PayloadCache()
+
+    def resolve(self, path):
+        """(file path, Cache-Control) of a request path, or None when it is not one of the roots' files."""
+        for root in self.roots:
+            if path == root.prefix and root.index:
+                name = root.index
+            elif path.startswith(root.prefix):
+                name = _safe_name(path[len(root.prefix):])
+                if name is None:
+                    continue
+            else:
+                continue
+            if root.names is not None and name not in root.names:
+                continue
+            cache_control = IMMUTABLE if root.immutable.search(name) else REVALIDATE
+            return os.path.join(root.directory, *name.split("/")), cache_control
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        target = None if "range" in headers else self.resolve(path)
+        payload = target and await anyio.to_thread.run_sync(self.cache.get, *target)
+        if not payload:
+            await self.app(scope, receive, send)
+            return
+        await payload_response(payload, headers, head=scope["method"] == "HEAD")(scope, receive, send)
+
+
+def default_roots(base_url=None):
+    """The app's ``static/`` at ``app/static/`` and Streamlit's frontend bundle at the site root."""
+    from streamlit import config, file_util
+
+    if base_url is None:
+        base_url = config.get_option("server.baseUrlPath") or ""
+    prefix = "/" + "".join(f"{part}/" for part in base_url.strip("/").split("/") if part)
+    roots = [Root(prefix + "app/static/", os.path.join(APP_DIR, "static"), FINGERPRINTED)]
+    bundle = file_util.get_static_dir()
+    if os.path.isdir(bundle):
+        # Package content, fixed for the process: requests for anything else (websocket, media,
+        # health checks) pass through without touching the filesystem
+        names = frozenset(
+            os.path.relpath(os.path.join(folder, file), bundle).replace(os.sep, "/")
+            for folder, _, files in os.walk(bundle)
+            for file in files
+        )
+        roots.append(Root(prefix, bundle, BUNDLE_HASHED, index="index.html", names=names))
+    return tuple(roots)
+
+
+def build_app(script=APP_SCRIPT, **front_options):
+    """The app with ``StaticFront`` in front; the factory for ``uvicorn --factory``."""
+    import streamlit as st
+
+    return st.App(script, middleware=[Middleware(StaticFront, **front_options)])
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the app with precompressed, cacheable static files.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8501)
+    args = parser.parse_args(argv)
+    uvicorn.run(build_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
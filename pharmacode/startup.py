@@ -0,0 +1,189 @@
+"""
+Cold-start profile of the app: where a new replica's first page view goes.
+
+    python -m pharmacode.startup [--drug entresto] [--top 12] [--json out.json]
+
+A replica imports Streamlit when its server starts. The app script's imports
+and its first run only happen when the first session connects, and that
+session waits for all of them. This command starts a fresh interpreter with
+``-X importtime``. It imports Streamlit's server, then runs the app once as
+that first session (``AppTest``), and once more as a warm rerun. It reports:
+
+* the server start's import time;
+* the first run's wall time, its imports by top-level package (self time,
+  so each module counts once) and the app's own phases;
+* the warm rerun, as the floor a cold start can be brought down to.
+
+The app times its phases with ``PHASES.mark``. The timer records only the
+process's first run, and only when ``PHARMACODE_STARTUP_PROFILE`` is set.
+Set it on a deployed replica to get the first run's phases on stderr:
+
+    PHARMACODE_STARTUP_PROFILE=1 streamlit run Entresto_app.py
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Entresto_app.py")
+ENV = "PHARMACODE_STARTUP_PROFILE"
+_RUN_MARKER = "# pharmacode.startup: first run"
+_END_MARKER = "# pharmacode.startup: end"
+
+
+class Phases:
+    """Durations of the named phases of the process's first script run; a no-op once that run is over."""
+
+    def __init__(self, enabled=False, clock=time.perf_counter):
+        self.phases = []  # (name, seconds)
+        self._clock = clock
+        self._done = not enabled
+        self._last = None
+
+    def start(self):
+        """Begin (or, after an interrupted run, begin again) timing the first run."""
+        if not self._done:
+            self.phases = []
+            self._last = self._clock()
+
+    def mark(self, name):
+        """End phase ``name``, which began at the previous mark or at ``start``."""
+        if self._done or self._last is None:
+            return
+        now = self._clock()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def finish(self, out=sys.stderr):
+        """Stop recording; write the phases to ``out`` (None: keep them only)."""
+        if self._done or self._last is None:
+            return
+        self._done = True
+        if out is not None:
+            out.write("startup phases of the first run (ms):\n")
+            for name, seconds in self.phases:
+                out.write(f"  {name:<24}{seconds * 1000:9.1f}\n")
+            out.write(f"  {'total':<24}{sum(seconds for _, seconds in self.phases) * 1000:9.1f}\n")
+            out.flush()
+
+
+PHASES = Phases(enabled=os.environ.get(ENV, "") not in ("", "0"))
+
+
+def parse_importtime(lines):
+    """``(module, self_us, cumulative_us, depth)`` per ``-X importtime`` line, in import order."""
+    rows = []
+    for line in lines:
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def by_package(rows):
+    """Self time (ms) per top-level package, largest first; the standard library is one entry."""
+    totals = {}
+    for module, self_us, _, _ in rows:
+        package = module.split(".")[0]
+        package = "(stdlib)" if package in sys.stdlib_module_names else package
+        totals[package] = totals.get(package, 0) + self_us / 1000
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def _child(app, drug, out_path, timeout):
+    """Inside the profiled interpreter: server imports, then a first run and a rerun of ``app``."""
+    started = time.perf_counter()
+    import streamlit  # noqa: F401
+    import streamlit.web.bootstrap  # noqa: F401
+    server_s = time.perf_counter() - started
+    from streamlit.testing.v1 import AppTest  # the harness: imported before the first run is marked
+
+    at = AppTest.from_file(app, default_timeout=timeout)
+    at.query_params["drug"] = drug
+    sys.stderr.write(_RUN_MARKER + "\n")
+    sys.stderr.flush()
+    started = time.perf_counter()
+    at.run()
+    first_run_s = time.perf_counter() - started
+    sys.stderr.write(_END_MARKER + "\n")
+    sys.stderr.flush()
+    started = time.perf_counter()
+    at.run()
+    rerun_s = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    result = {
+        "server_import_ms": server_s * 1000,
+        "first_run_ms": first_run_s * 1000,
+        "rerun_ms": rerun_s * 1000,
+        "phases_ms": {name: seconds * 1000 for name, seconds in PHASES.phases},
+    }
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+def profile(app=APP, drug="entresto", timeout=60):
+    """Run ``app`` cold in a fresh interpreter; the profile as a dict of milliseconds."""
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = os.path.join(tmp, "profile.json")
+        code = f"from pharmacode.startup import _child; _child({app!r}, {drug!r}, {out_path!r}, {timeout!r})"
+        env = dict(os.environ, **{ENV: "1"})
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=env, capture_output=True, text=True,
+        )
+        lines = proc.stderr.splitlines()
+        if proc.returncode:
+            raise RuntimeError("profiled run failed:\n" + "\n".join(line for line in lines if not line.startswith("import time:")))
+        with open(out_path, encoding="utf-8") as f:
+            result = json.load(f)
+    start, end = lines.index(_RUN_MARKER), lines.index(_END_MARKER)
+    server_rows, run_rows = parse_importtime(lines[:start]), parse_importtime(lines[start:end])
+    result["server_imports_ms"] = sum(self_us for _, self_us, _, _ in server_rows) / 1000
+    result["first_run_imports_ms"] = sum(self_us for _, self_us, _, _ in run_rows) / 1000
+    result["first_run_packages_ms"] = by_package(run_rows)
+    result["first_run_modules_ms"] = {module: cumulative_us / 1000 for module, _, cumulative_us, depth in run_rows if depth == 0}
+    return result
+
+
+def report(result, top=12, out=sys.stdout):
+    out.write(f"server start: import streamlit      {result['server_import_ms']:8.1f} ms\n")
+    out.write(f"first run (cold)                     {result['first_run_ms']:8.1f} ms\n")
+    out.write(f"  imports                            {result['first_run_imports_ms']:8.1f} ms\n")
+    for package, ms in list(result["first_run_packages_ms"].items())[:top]:
+        out.write(f"    {package:<32}{ms:8.1f}\n")
+    out.write("  imported by the app (cumulative)\n")
+    modules = sorted(result["first_run_modules_ms"].items(), key=lambda item: -item[1])
+    for module, ms in modules[:top]:
+        out.write(f"    {module:<32}{ms:8.1f}\n")
+    out.write("  app phases\n")
+    for name, ms in result["phases_ms"].items():
+        out.write(f"    {name:<32}{ms:8.1f}\n")
+    out.write(f"rerun (warm)                         {result['rerun_ms']:8.1f} ms\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the app's cold start: server imports, first run, phases.")
+    parser.add_argument("--app", default=APP)
+    parser.add_argument("--drug", default="entresto", help="monograph key (pharmacode/monographs/<key>.json)")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--top", type=int, default=12, help="packages and modules listed")
+    parser.add_argument("--json", help="also write the profile to this file")
+    args = parser.parse_args(argv)
+
+    result = profile(args.app, args.drug, args.timeout)
+    report(result, args.top)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(json.dumps(result, indent=1) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+The app stylesheet, minified and content-hashed once per process.
+
+``pharmacode/styles/app.css`` is the editable source. ``build_stylesheet``
+strips comments and whitespace and, given an output directory, writes it as
+``app.<hash>.css`` for static serving: the page then carries a short
+``<link>`` instead of the full ``<style>`` block, and the browser caches the
+file under a name that changes whenever the CSS does.
+"""
+
+import html
+import os
+import re
+from dataclasses import dataclass
+
+from pharmacode.assets import content_digest, write_fingerprinted
+
+STYLESHEET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "styles", "app.css")
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_SPACE = re.compile(r"\s+")
+_PUNCT = re.compile(r"\s*([{};,>])\s*")
+_COLON = re.compile(r":\s+")
+
+
+@dataclass(frozen=True, slots=True)
+class Stylesheet:
+    text: str
+    digest: str
+    filename: str | None  # None when only inline injection is possible
+
+
+def minify_css(css):
+    css = _SPACE.sub(" ", _COMMENT.sub("", css))
+    css = _COLON.sub(":", _PUNCT.sub(r"\1", css))
+    return css.replace(";}", "}").strip()
+
+
+def build_stylesheet(src=STYLESHEET, out_dir=None):
+    with open(src, encoding="utf-8") as f:
+        text = minify_css(f.read())
+    data = text.encode("utf-8")
+    filename = write_fingerprinted(data, out_dir, "app", "css") if out_dir is not None else None
+    return Stylesheet(text, content_digest(data), filename)
+
+
+def stylesheet_html(sheet, url_prefix):
+    """``<link>`` to the fingerprinted file, or an inline ``<style>`` without one."""
+    if sheet.filename:
+        return f'<link rel="stylesheet" href="{html.escape(url_prefix + sheet.filename)}">'
+    return f"<style>{sheet.text}</style>"
@@ -0,0 +1,309 @@
+"""
+HTML templates turning a ``Monograph`` into ``pharmacode.render`` blocks.
+
+Text fields are plain text: they are HTML-escaped here, with ``**bold**``
+and ``*italic*`` as the only inline markup. Callouts and markdown headings
+are passed through to Streamlit's markdown unchanged.
+"""
+
+import html
+import re
+
+from pharmacode.model import Box, Card, Cards, Section
+from pharmacode.render import Columns, Expander, Header, Html, Tab
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_ITALIC = re.compile(r"\*(.+?)\*")
+
+SCHEDULES = {"BID": "Twice Daily (BID)", "QD": "Once Daily (QD)"}
+ADJUSTMENT_ACCENTS = {"hepatic": "#dc2626"}
+INTERACTION_GROUPS = {
+    # group: (icon, accent, badge color, badge text)
+    "contraindicated": ("🚫", "#dc2626", "red", "CONTRAINDICATED"),
+    "monitor": ("🟡", "#eab308", "yellow", "MONITOR"),
+    "transporter": ("🔵", "#3b82f6", "blue", "MONITOR"),
+    "safe": ("✅", "#22c55e", "green", "SAFE"),
+}
+FEATURED_ACCENT = "#e74c3c"
+
+CARD = '<div class="card-item"{style}>\n    <h4>{title}</h4>\n{details}\n</div>'
+DETAIL = '    <p class="card-detail">{text}</p>'
+SOURCE = '    <p class="card-detail" style="color: #64748b; font-size: 0.85rem;">Source: {source}</p>'
+BADGE = '<span class="card-badge card-badge-{color}">{text}</span>'
+REFERENCE = (
+    '<div class="reference-item">\n'
+    '    <strong>{title}</strong>\n'
+    '    <p class="card-detail">{description}</p>\n'
+    '    <a href="{href}" target="_blank">🔗 {url}</a>\n'
+    '</div>'
+)
+TITLE = '<h1 class="main-header">{title}</h1>\n<p class="sub-header">{subtitle}</p>'
+FOOTER = (
+    '<div style="text-align: center; color: #64748b; padding: 2rem 0;">\n'
+    '    <p><strong>{name} Professional Drug Information</strong></p>\n'
+    '    <p style="font-size: 0.9rem; margin-top: 1rem;">\n'
+    '        ⚠️ <em>This information is for healthcare professionals only. \n'
+    '        Always consult the full prescribing information and clinical judgment when making treatment decisions.</em>\n'
+    '    </p>\n'
+    '</div>'
+)
+
+
+def inline(text):
+    text = html.escape(text, quote=False)
+    return _ITALIC.sub(r"<em>\1</em>", _BOLD.sub(r"<strong>\1</strong>", text))
+
+
+def _style(style):
+    return f' style="{html.escape(style)}"' if style else ""
+
+
+def _badge(text, color):
+    return BADGE.format(color=color, text=inline(text))
+
+
+# ==================== GENERIC TEMPLATES ====================
+def box_html(box):
+    lines = [f'<div class="{box.kind}-box">']
+    for part in box.parts:
+        if part[0] == "h":
+            _, level, text, style = part
+            lines.append(f"<h{level}{_style(style)}>{inline(text)}</h{level}>")
+        elif part[0] == "p":
+            _, text, style = part
+            lines.append(f"<p{_style(style)}>{inline(text)}</p>")
+        elif part[0] == "fact":
+            _, icon, label, value = part
+            lines.append(f'<p class="card-detail">{icon} <strong>{inline(label)}:</strong> {inline(value)}</p>')
+        elif part[0] == "ul":
+            lines.append("<ul>")
+            lines.extend(f"    <li>{inline(item)}</li>" for item in part[1])
+            lines.append("</ul>")
+    lines.append("</div>")
+    return "\n".join(lines)
+
+
+def _detail_html(detail):
+    if isinstance(detail, str):
+        return inline(detail)
+    if detail[0] == "badge":
+        return _badge(detail[1], detail[2])
+    label, value = detail
+    value = _badge(value[1], value[2]) if isinstance(value, tuple) else inline(value)
+    return f"<strong>{inline(label)}:</strong> {value}"
+
+
+def card_html(card):
+    style = ""
+    if card.accent:
+        style = f"border-left: 4px solid {card.accent};"
+        if card.outline:
+            style += f" border: 2px solid {card.accent};"
+    title = inline(card.title)
+    if card.badge:
+        title += " " + _badge(*card.badge)
+    details = [DETAIL.format(text=_detail_html(detail)) for detail in card.details]
+    if card.source:
+        details.append(SOURCE.format(source=inline(card.source)))
+    return CARD.format(style=_style(style), title=title, details="\n".join(details))
+
+
+def cards_html(cards):
+    return "\n".join(card_html(card) for card in cards)
+
+
+# ==================== CLINICAL SECTIONS ====================
+def _dose_text(dose):
+    if dose.mg_per_kg is not None:
+        return f"{dose.mg_per_kg:g} mg/kg"
+    if dose.tablets > 1:
+        total = "/".join(f"{float(mg) * dose.tablets:g}" for mg in dose.strength.split("/"))
+        return f"{total} mg ({dose.tablets} × {dose.strength} mg)"
+    return f"{dose.strength} mg"
+
+
+def strength_cards(monograph):
+    for strength in monograph.strengths:
+        amounts = " / ".join(f"{mg:g} mg" for _, mg in strength.components)
+        described = " / ".join(f"{name} {mg:g} mg" for name, mg in strength.components)
+        yield Card(f"💊 {amounts} — {strength.form}", (f"{described} — {strength.role}",))
+
+
+def adult_dosing_cards(monograph):
+    generic = monograph.drug.generic.lower()
+    for regimen in monograph.dosing.adult:
+        yield Card(regimen.step, (
+            ("Dose", f"{regimen.strength} mg ({generic})"),
+            ("Schedule", SCHEDULES.get(regimen.frequency, regimen.frequency)),
+            ("Note", regimen.note),
+        ))
+
+
+def pediatric_dosing_cards(monograph):
+    frequency = monograph.dosing.frequency
+    for band in monograph.dosing.pediatric:
+        yield Card(f"📏 Weight {band.weight}", (
+            ("Starting", f"{_dose_text(band.start)} {frequency}"),
+            ("Target", f"{_dose_text(band.target)} {frequency}"),
+            ("Titration", f"Every {band.titration_weeks} weeks"),
+        ))
+
+
+def dose_adjustment_cards(monograph, population):
+    frequency = monograph.dosing.frequency
+    for adjustment in monograph.dosing.adjustments:
+        if adjustment.population != population:
+            continue
+        if adjustment.start:
+            dose = ("Dose", f"Start with {adjustment.start} mg {frequency}")
+        else:
+            dose = ("badge", "NOT RECOMMENDED", "red")
+        yield Card(
+            f"{adjustment.icon} {adjustment.title}",
+            (dose, ("Note", adjustment.note)),
+            accent=ADJUSTMENT_ACCENTS.get(population),
+        )
+
+
+def pk_cards(monograph):
+    for profile in monograph.pharmacokinetics:
+        half_life = f"{profile.half_life_h:g} hours"
+        if profile.half_life_note:
+            half_life += f" ({profile.half_life_note})"
+        details = [("Bioavailability", profile.bioavailability)] if profile.bioavailability else []
+        details += [
+            ("Tmax", f"{profile.tmax_h:g} hours"),
+            ("Half-life", half_life),
+            ("Protein Binding", profile.protein_binding),
+            ("Metabolism", profile.metabolism),
+            ("Excretion", profile.excretion),
+        ]
+        yield Card(f"📊 {profile.title}", tuple(details))
+
+
+def contraindication_cards(monograph):
+    for number, item in enumerate(monograph.contraindications, 1):
+        yield Card(f"🚨 {number}. {item.title}", (("Risk", item.risk), ("Action", item.action)), accent="#dc2626")
+
+
+def adverse_reaction_cards(monograph):
+    for reaction in monograph.adverse_reactions:
+        if not reaction.listed:
+            continue
+        yield Card(
+            f"{reaction.icon} {reaction.name}",
+            (f"💡 {reaction.note}",),
+            badge=(f"{reaction.incidence_pct:g}%", reaction.badge),
+        )
+
+
+def interaction_cards(monograph, group):
+    icon, accent, color, label = INTERACTION_GROUPS[group]
+    for interaction in monograph.interactions:
+        if interaction.group != group:
+            continue
+        details = [
+            (name, value) for name, value in (
+                ("Mechanism", interaction.mechanism),
+                ("Consequence", interaction.consequence),
+                ("Action", interaction.action),
+            ) if value
+        ]
+        if interaction.note:
+            details.append(interaction.note)
+        yield Card(
+            f"{icon} {interaction.name}",
+            tuple(details),
+            badge=(label, color),
+            accent=accent,
+            source=interaction.source,
+        )
+
+
+def comparison_cards(monograph):
+    for drug in monograph.comparison:
+        efficacy = ("badge", drug.efficacy, "green") if drug.featured else drug.efficacy
+        yield Card(
+            f"{drug.icon} {drug.name}",
+            (
+                ("Class", drug.drug_class),
+                ("Use", drug.use),
+                ("Mechanism", drug.mechanism),
+                ("Key Toxicity", drug.key_toxicity),
+                ("Food", drug.food),
+                ("Efficacy", efficacy),
+            ),
+            accent=FEATURED_ACCENT if drug.featured else None,
+            outline=drug.featured,
+        )
+
+
+def reference_html(monograph, category):
+    return "\n".join(
+        REFERENCE.format(
+            title=inline(ref.title),
+            description=inline(ref.description),
+            href=html.escape(ref.url),
+            url=html.escape(ref.url, quote=False),
+        )
+        for ref in monograph.references
+        if ref.category == category
+    )
+
+
+SECTION_CARDS = {
+    "strengths": strength_cards,
+    "adult_dosing": adult_dosing_cards,
+    "pediatric_dosing": pediatric_dosing_cards,
+    "dose_adjustments": dose_adjustment_cards,
+    "pharmacokinetics": pk_cards,
+    "contraindications": contraindication_cards,
+    "adverse_reactions": adverse_reaction_cards,
+    "interactions": interaction_cards,
+    "comparison": comparison_cards,
+}
+
+
+def section_html(monograph, section):
+    if section.name == "references":
+        return reference_html(monograph, section.option)
+    render = SECTION_CARDS[section.name]
+    cards = render(monograph, section.option) if section.option else render(monograph)
+    return cards_html(cards)
+
+
+# ==================== PAGE ====================
+def title_html(drug):
+    return TITLE.format(title=html.escape(drug.title, quote=False), subtitle=html.escape(drug.subtitle, quote=False))
+
+
+def footer_html(drug):
+    return FOOTER.format(name=html.escape(f"{drug.brand} ({drug.generic})", quote=False))
+
+
+# ==================== TABS ====================
+def build_blocks(monograph, blocks):
+    built = []
+    for block in blocks:
+        if isinstance(block, Box):
+            block = Html(box_html(block))
+        elif isinstance(block, Cards):
+            block = Html(cards_html(block.cards))
+        elif isinstance(block, Section):
+            block = Html(section_html(monograph, block))
+        elif isinstance(block, Expander):
+            block = Expander(block.label, build_blocks(monograph, block.blocks))
+        elif isinstance(block, Columns):
+            block = Columns(tuple(build_blocks(monograph, column) for column in block.columns))
+        built.append(block)
+    return tuple(built)
+
+
+def build_tab(monograph, spec):
+    """Render one tab of ``monograph`` into raw (unprepared) blocks."""
+    return Tab(spec.key, spec.label, (Header(spec.header),) + build_blocks(monograph, spec.blocks))
+
+
+def build_tabs(monograph):
+    """Render every tab of ``monograph`` into raw (unprepared) blocks."""
+    return tuple(build_tab(monograph, spec) for spec in monograph.tabs)
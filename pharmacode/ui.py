@@ -0,0 +1,532 @@
+"""
+Streamlit side of the app: process-wide caches (drug list, monograph, section hashes, deploy-time artifact, tabs, image,
+stylesheet, tracker, search index, dose table, interaction index, PK model and simulations, reference
+snapshots, adverse-reaction chart specs), the block emitter and the interactive widgets (search box, pediatric
+dose calculator, interaction checker, PK simulator, cached reference citations, adverse-reaction chart).
+"""
+
+import inspect
+import os
+import re
+
+import streamlit as st
+
+from pharmacode.analytics import build_tracker
+from pharmacode.artifact import artifact_path, open_artifact
+from pharmacode.images import build_variants
+from pharmacode.interactions import build_interaction_index, parse_medications
+from pharmacode.model import available_drugs, load_monograph
+from pharmacode.references import Citation, load_store
+from pharmacode.render import (
+    Callout,
+    Columns,
+    Divider,
+    Expander,
+    Header,
+    Html,
+    Markdown,
+    Widget,
+    prepare_tabs,
+)
+from pharmacode.search import build_index, snippet
+from pharmacode.styles import build_stylesheet
+from pharmacode.templates import INTERACTION_GROUPS, build_tab
+from pharmacode.versioning import combined_hash, load_section_hashes, tab_key
+
+# pandas and numpy (pharmacode.dosing, .pk, .safety) are imported where first used. They are most of a cold
+# first run's import time (python -m pharmacode.startup), and none of the widgets needing them is on the
+# tabs a first run shows.
+
+# Monographs whose content stays cached in one process (least recently used evicted first); stylesheet and
+# tracker are shared by all drugs, tabs and tables with identical content hashes are shared too
+DRUG_CACHE_SIZE = 8
+# Streamlit >= 1.5x can track the open tab (st.tabs(on_change="rerun")) and skip the others
+LAZY_TABS_SUPPORTED = "on_change" in inspect.signature(st.tabs).parameters
+# ... and whether an expander is open (st.expander(on_change="rerun"))
+LAZY_EXPANDERS_SUPPORTED = "on_change" in inspect.signature(st.expander).parameters
+
+
+# Caches below the monograph are keyed by section content hashes (pharmacode.versioning): when the file
+# changes, only what was built from a changed section is rebuilt. ``mtime_ns`` picks up a changed file.
+@st.cache_resource(show_spinner=False, ttl=30)
+def cached_drugs():
+    """Available monograph keys; new files are picked up within 30 s."""
+    return available_drugs()
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE)
+def cached_monograph(path, mtime_ns=None):
+    """The parsed monograph, loaded once per file version and shared by all sessions."""
+    return load_monograph(path)
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE)
+def cached_section_hashes(path, mtime_ns=None):
+    return load_section_hashes(path)
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE)
+def cached_artifact(path, mtime_ns=None):
+    """The monograph's deploy-time artifact (``python -m pharmacode.artifact build``), mapped once per process.
+
+    None without a current one: tabs, search index and image variants are then built in the process.
+    """
+    drug = os.path.splitext(os.path.basename(path))[0]
+    return open_artifact(artifact_path(drug), cached_section_hashes(path, mtime_ns))
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE * 16)
+def _tab(tab_hash, _monograph, _spec):
+    return prepare_tabs((build_tab(_monograph, _spec),))[0]
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE)
+def cached_tabs(path, mtime_ns=None):
+    """Prepared tab blocks; a tab is rebuilt only when its own content hash changes."""
+    artifact = cached_artifact(path, mtime_ns)
+    if artifact is not None:
+        return artifact.tabs()
+    monograph, hashes = cached_monograph(path, mtime_ns), cached_section_hashes(path, mtime_ns)
+    return tuple(_tab(hashes[tab_key(spec.key)], monograph, spec) for spec in monograph.tabs)
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE)
+def cached_search_index(path, mtime_ns=None):
+    """Inverted index over every tab; the typo index is only extended by new words.
+
+    From an artifact, the index is queried in its mapping, shared with the other workers.
+    """
+    artifact = cached_artifact(path, mtime_ns)
+    if artifact is not None:
+        return artifact.search_index()
+    return build_index(cached_tabs(path, mtime_ns))
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE)
+def _dose_table(content_hash, _monograph):
+    from pharmacode.dosing import build_dose_table
+
+    return build_dose_table(_monograph)
+
+
+def cached_dose_table(path, mtime_ns=None):
+    """Pediatric dose arrays and tablet combinations, rebuilt when dosing or strengths change."""
+    hashes = cached_section_hashes(path, mtime_ns)
+    return _dose_table(combined_hash(hashes, "dosing", "strengths"), cached_monograph(path, mtime_ns))
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE)
+def _interaction_index(content_hash, _monograph):
+    return build_interaction_index(_monograph)
+
+
+def cached_interaction_index(path, mtime_ns=None):
+    """Drug-name hash index over the interactions, rebuilt when they change."""
+    hashes = cached_section_hashes(path, mtime_ns)
+    return _interaction_index(hashes["interactions"], cached_monograph(path, mtime_ns))
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE)
+def _pk_model(content_hash, _monograph):
+    from pharmacode.pk import build_pk_model
+
+    return build_pk_model(_monograph)
+
+
+def cached_pk_model(path, mtime_ns=None):
+    """Rate constants per analyte, rebuilt when the PK table or strengths change."""
+    hashes = cached_section_hashes(path, mtime_ns)
+    return _pk_model(combined_hash(hashes, "pharmacokinetics", "strengths"), cached_monograph(path, mtime_ns))
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE * 32)
+def _pk_simulation(model_hash, doses_mg, interval_h, days, _model):
+    from pharmacode.pk import simulate
+
+    return simulate(_model, doses_mg, interval_h, days)
+
+
+def cached_pk_simulation(path, mtime_ns, doses_mg, interval_h, days):
+    """Concentration curves per (doses, interval, days), computed once and shared by all sessions."""
+    model_hash = combined_hash(cached_section_hashes(path, mtime_ns), "pharmacokinetics", "strengths")
+    return _pk_simulation(model_hash, tuple(doses_mg), float(interval_h), float(days), cached_pk_model(path, mtime_ns))
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE)
+def _adverse_chart_specs(content_hash, _monograph):
+    from pharmacode.safety import chart_specs
+
+    return chart_specs(_monograph)
+
+
+def cached_adverse_chart_specs(path, mtime_ns=None):
+    """Vega-Lite specs per subgroup, built once per version of the adverse reactions."""
+    hashes = cached_section_hashes(path, mtime_ns)
+    return _adverse_chart_specs(combined_hash(hashes, "adverse_reactions", "drug"), cached_monograph(path, mtime_ns))
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE)
+def cached_reference_store(path, mtime_ns=None):
+    """Reference snapshots (``python -m pharmacode.references verify``), reloaded when the store changes."""
+    return load_store(path)
+
+
+@st.cache_resource(show_spinner=False, max_entries=DRUG_CACHE_SIZE)
+def cached_image_set(path, out_dir, mtime_ns, _artifact=None):
+    """Responsive variants of ``path``, rebuilt only when its mtime changes; None if they cannot be written.
+
+    ``_artifact`` (not part of the cache key) lists variants encoded at deploy time.
+    """
+    image_set = _artifact.image_set(path, out_dir) if _artifact is not None else None
+    if image_set is not None:
+        return image_set
+    try:
+        return build_variants(path, out_dir)
+    except OSError:
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def cached_stylesheet(out_dir):
+    """Minified stylesheet written once as a fingerprinted static file (inline-only if that fails)."""
+    try:
+        return build_stylesheet(out_dir=out_dir)
+    except OSError:
+        return build_stylesheet()
+
+
+@st.cache_resource(show_spinner=False)
+def cached_tracker(out_dir):
+    """Analytics tracker published once as a fingerprinted static file (inline-only if that fails)."""
+    try:
+        return build_tracker(out_dir=out_dir)
+    except OSError:
+        return build_tracker()
+
+
+def render_blocks(blocks, widgets=None, deferred=None, key_prefix=None, open_path=(), lazy=False):
+    """Emit ``blocks``; ``widgets`` maps ``Widget`` names to the callables drawing them.
+
+    With a ``deferred`` list, expanders are emitted collapsed and empty and
+    their bodies queued there for ``render_deferred``. With a ``key_prefix``
+    (unique on the page), expanders are keyed by position, and with
+    ``lazy`` their bodies are only emitted while they are open. Expanders
+    labelled in ``open_path`` (a search hit's trail) are opened.
+    """
+    for i, block in enumerate(blocks):
+        key = f"{key_prefix}.{i}" if key_prefix is not None else None
+        if isinstance(block, Html):
+            st.markdown(block.text, unsafe_allow_html=True)
+        elif isinstance(block, Markdown):
+            st.markdown(block.text)
+        elif isinstance(block, Header):
+            st.header(block.text)
+        elif isinstance(block, Callout):
+            getattr(st, block.kind)(block.text)
+        elif isinstance(block, Divider):
+            st.markdown("---")
+        elif isinstance(block, Widget):
+            if widgets and block.name in widgets:
+                widgets[block.name]()
+        elif isinstance(block, Expander):
+            opened = block.label in open_path
+            if lazy:
+                if opened:
+                    st.session_state[key] = True
+                container = st.expander(block.label, key=key, on_change="rerun")
+                if not container.open:
+                    continue
+            elif key is not None:
+                # The browser keeps a keyed expander's open state; ``expanded`` only applies when it first appears
+                container = st.expander(block.label, expanded=opened, key=key)
+            else:
+                container = st.expander(block.label, expanded=opened)
+            if deferred is not None:
+                deferred.append((container, block.blocks, key, open_path, lazy))
+            else:
+                with container:
+                    render_blocks(block.blocks, widgets, None, key, open_path, lazy)
+        elif isinstance(block, Columns):
+            for j, (column, column_blocks) in enumerate(zip(st.columns(len(block.columns)), block.columns)):
+                with column:
+                    render_blocks(
+                        column_blocks, widgets, deferred, f"{key}.{j}" if key is not None else None, open_path, lazy
+                    )
+
+
+def render_deferred(deferred, widgets=None):
+    """Fill the expanders queued by ``render_blocks``, outer ones first."""
+    while deferred:
+        container, blocks, key_prefix, open_path, lazy = deferred.pop(0)
+        with container:
+            render_blocks(blocks, widgets, deferred, key_prefix, open_path, lazy)
+
+
+def render_tabs(tabs, lazy=True, prefetch=1, key="main_tabs", widgets=None, deferred=None, lazy_expanders=False):
+    """Emit ``tabs``; in lazy mode only the open tab and ``prefetch`` neighbours each side.
+
+    Prefetched neighbours are already on the page when the user switches to
+    them, so the switch does not wait for the rerun. The open tab is emitted
+    first; ``deferred`` is passed on to ``render_blocks``, as is lazy
+    expander mode when ``lazy_expanders`` is set.
+
+    After a search jump (``_jump``) the expanders holding the hit are
+    opened on this run only; the reader can close them again. Keyed
+    expanders take their open state from the browser once they are on the
+    page, so the jump counter is part of their keys: a jump puts fresh ones
+    on the page, opened where the hit is. Returns the open tab's index.
+    """
+    labels = [tab.label for tab in tabs]
+    lazy = lazy and LAZY_TABS_SUPPORTED
+    lazy_expanders = lazy_expanders and LAZY_EXPANDERS_SUPPORTED
+    target_tab, open_path = st.session_state.pop(f"{key}.target", (None, ()))
+    jumps = st.session_state.get(f"{key}.jumps", 0)
+    containers = st.tabs(labels, key=key, on_change="rerun") if lazy else st.tabs(labels)
+    active = next((i for i, container in enumerate(containers) if container.open), 0) if lazy else 0
+    order = sorted(range(len(tabs)), key=lambda i: (i != active, abs(i - active), i))
+    for i in order:
+        if not lazy or abs(i - active) <= prefetch:
+            with containers[i]:
+                if lazy_expanders:
+                    prefix = f"{key}.{tabs[i].key}"
+                elif LAZY_EXPANDERS_SUPPORTED:  # the same release added expander keys
+                    prefix = f"{key}.{tabs[i].key}.{jumps}"
+                else:
+                    prefix = None
+                render_blocks(
+                    tabs[i].blocks, widgets, deferred, prefix,
+                    open_path if tabs[i].key == target_tab else (), lazy_expanders,
+                )
+    return active
+
+
+def _jump(key, section):
+    """Open the tab and expanders holding ``section``: its tab now, its expanders in ``render_tabs``."""
+    st.session_state[key] = section.tab_label
+    st.session_state[f"{key}.target"] = (section.tab_key, section.path)
+    st.session_state[f"{key}.jumps"] = st.session_state.get(f"{key}.jumps", 0) + 1
+
+
+def render_search(index, limit=8, key="search", tabs_key="main_tabs"):
+    """Search box over ``index``; each hit shows its card and a button opening its tab and expander."""
+    query = st.text_input(
+        "Search",
+        key=key,
+        placeholder="🔎 Search all sections (e.g. eGFR, angioedema, lisinopril)",
+        label_visibility="collapsed",
+    )
+    if not query.strip():
+        return []
+    hits = index.search(query, limit=limit)
+    if not hits:
+        st.caption(f"No matches for “{query}”.")
+    for i, hit in enumerate(hits):
+        section = hit.section
+        where = " › ".join((section.tab_label,) + section.path)
+        with st.expander(f"{where} — {section.title or section.text[:60]}", expanded=i == 0):
+            if section.html:
+                st.markdown(section.html, unsafe_allow_html=True)
+            else:
+                st.markdown(snippet(section, hit.terms))
+            if LAZY_TABS_SUPPORTED:
+                st.button(
+                    f"Open {section.tab_label}",
+                    key=f"{key}_open_{section.id}",
+                    on_click=_jump,
+                    args=(tabs_key, section),
+                )
+    return hits
+
+
+def pediatric_calculator(table, key="pediatric_weight"):
+    """Weight input and the resulting titration schedule."""
+    from pharmacode.dosing import pediatric_schedule, tablets_text
+
+    weight = st.number_input(
+        "🧮 Patient weight (kg)", min_value=0.0, max_value=200.0, value=None, step=0.5, key=key,
+        placeholder="Enter weight to calculate the titration schedule",
+    )
+    if weight is None:
+        return None
+    schedule = pediatric_schedule(table, weight)
+    if not schedule:
+        st.warning("No pediatric dosing band covers this weight.")
+        return schedule
+    suspension = f"Suspension ({table.suspension_mg_per_ml:g} mg/mL)" if table.suspension_mg_per_ml else None
+    rows = []
+    for step in schedule:
+        row = {"Week": step.week, f"Dose (mg {table.frequency})": round(step.mg, 1)}
+        if suspension:
+            row[f"{suspension}, mL"] = step.suspension_ml
+        row["Tablets"] = tablets_text(step.tablets) if step.tablets else "— use suspension"
+        rows.append(row)
+    st.dataframe(rows, hide_index=True)
+    st.caption(
+        "Total sacubitril/valsartan per dose. Advance one step every titration interval as tolerated; "
+        "tablet combinations are shown only within 10% of the calculated dose."
+    )
+    return schedule
+
+
+# Streamlit message box per interaction group
+FINDING_BOXES = {"contraindicated": st.error, "monitor": st.warning, "transporter": st.info, "safe": st.success}
+
+
+def interaction_checker(index, key="interaction_meds"):
+    """Medication list input and the interactions found in it, most severe first."""
+    text = st.text_area(
+        "🔍 Check a medication list", key=key, height=100,
+        placeholder="One per line or comma-separated, e.g. lisinopril 10 mg, Aleve, atorvastatin",
+    )
+    if not text.strip():
+        return None
+    report = index.check(parse_medications(text))
+    for finding in report.findings:
+        interaction = finding.interaction
+        icon, _, _, label = INTERACTION_GROUPS[finding.group]
+        lines = [f"**{icon} {finding.medication}** — {interaction.name} · **{label}**"]
+        lines += [
+            f"**{name}:** {value}" for name, value in (
+                ("Mechanism", interaction.mechanism),
+                ("Action", interaction.action),
+                ("Source", interaction.source),
+            ) if value
+        ]
+        if interaction.note:
+            lines.append(interaction.note)
+        FINDING_BOXES[finding.group]("  \n".join(lines))
+    if report.unmatched:
+        st.caption("No listed interaction: " + ", ".join(report.unmatched))
+    return report
+
+
+def pk_chart_spec(analytes):
+    """Line per analyte; the data stays wide (one row per time point) and is folded in the browser."""
+    return {
+        "transform": [{"fold": list(analytes), "as": ["Analyte", "mg"]}],
+        "mark": {"type": "line", "interpolate": "monotone"},
+        "encoding": {
+            "x": {"field": "Day", "type": "quantitative"},
+            "y": {"field": "mg", "type": "quantitative", "title": "Amount in the body (mg)"},
+            "color": {"field": "Analyte", "type": "nominal", "sort": list(analytes)},
+        },
+    }
+
+
+def pk_simulator(model, strengths, frequency, simulation, key="pk_strength"):
+    """Strength and duration inputs, the simulated curves and the steady-state figures.
+
+    ``frequency`` is the label's ("BID"); ``simulation(doses_mg, interval_h, days)``
+    returns a ``pharmacode.pk.Simulation`` (``cached_pk_simulation`` bound to the monograph).
+    """
+    import pandas as pd
+
+    from pharmacode.pk import INTERVALS_H, strength_doses
+
+    interval_h = INTERVALS_H[frequency]
+    labels = {strength.short: strength for strength in strengths}
+    col1, col2 = st.columns(2)
+    short = col1.selectbox(
+        "📈 Strength per dose", tuple(labels), index=None, key=key, format_func=lambda label: f"{label} mg",
+        placeholder="Choose a strength to simulate",
+    )
+    days = col2.slider("Days of dosing", min_value=1, max_value=28, value=14, key=f"{key}_days")
+    if short is None:
+        return None
+    result = simulation(strength_doses(model, labels[short]), interval_h, days)
+    curves = pd.DataFrame(result.amount_mg.T.astype("float32"), columns=result.analytes)
+    curves.insert(0, "Day", (result.time_h / 24).astype("float32"))
+    st.vega_lite_chart(curves, pk_chart_spec(result.analytes), width="stretch")
+    st.dataframe(
+        [
+            {
+                "Analyte": name,
+                "Dose (mg)": f"{result.doses_mg[i]:g}",
+                "Steady-state peak (mg)": round(float(result.peak_mg[i]), 1),
+                "Steady-state trough (mg)": round(float(result.trough_mg[i]), 1),
+                "Accumulation": f"{result.accumulation[i]:.2f}×",
+                "90% of steady state": f"{result.steady_state_h[i] / 24:.1f} days",
+            }
+            for i, name in enumerate(result.analytes)
+        ],
+        hide_index=True,
+    )
+    formed = [f"{name} is formed from the {parent} dose" for name, parent in zip(model.analytes, model.components) if name != parent]
+    st.caption(
+        f"One-compartment model from the Tmax, half-life and bioavailability above, one dose every {interval_h:g} h. "
+        "Amounts are proportional to plasma concentration within an analyte, not between analytes"
+        + "".join(f"; {text}" for text in formed) + "."
+    )
+    return result
+
+
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_{}\[\]<>#|~$])")
+MAX_AUTHORS = 6  # then "et al."
+
+
+def _escape_markdown(text):
+    return _MARKDOWN_SPECIAL.sub(r"\\\1", text)
+
+
+def _citation_line(citation):
+    authors = list(citation.authors[:MAX_AUTHORS]) + (["et al."] if len(citation.authors) > MAX_AUTHORS else [])
+    parts = [", ".join(authors), citation.journal, citation.date]
+    line = ". ".join(_escape_markdown(part) for part in parts if part)
+    if citation.doi:
+        line += f" · [doi:{citation.doi}](https://doi.org/{citation.doi})"
+    if citation.pmid:
+        line += f" · PMID {citation.pmid}"
+    return line
+
+
+def reference_snapshots(references, store, key="reference_snapshot"):
+    """Link status of every reference and, for a chosen one, its cached citation and abstract."""
+    if not store:
+        st.caption("No snapshots yet: run `python -m pharmacode.references verify` to cache the references.")
+        return None
+    rows = []
+    for ref in references:
+        snapshot = store.get(ref.id)
+        if snapshot is None:
+            status = "— not checked"
+        elif snapshot.ok:
+            status = "✅ reachable"
+        else:
+            status = f"❌ {snapshot.error or snapshot.status}"
+        verified = snapshot.verified_at[:10] if snapshot and snapshot.verified_at else "—"
+        rows.append({"Reference": ref.title, "Link": status, "Last verified": verified})
+    st.dataframe(rows, hide_index=True)
+
+    titles = {ref.id: ref.title for ref in references if ref.id in store and store[ref.id].verified_at}
+    ref_id = st.selectbox(
+        "📄 Cached citation", tuple(titles), index=None, key=key, format_func=titles.get,
+        placeholder="Choose a reference to read its citation without leaving the app",
+    )
+    if ref_id is None:
+        return None
+    snapshot = store[ref_id]
+    citation = snapshot.citation or Citation()
+    st.markdown(f"**{_escape_markdown(citation.title or titles[ref_id])}**")
+    line = _citation_line(citation)
+    if line:
+        st.markdown(line)
+    if snapshot.abstract:
+        st.markdown(_escape_markdown(snapshot.abstract))
+    if not snapshot.ok:
+        st.warning(f"The link failed its last check ({snapshot.error}); this is the snapshot of {snapshot.verified_at[:10]}.")
+    st.caption(f"Snapshot of {snapshot.final_url or snapshot.url}, verified {snapshot.verified_at[:10]}.")
+    return snapshot
+
+
+def adverse_reaction_chart(specs, key="adverse_subgroup"):
+    """Incidence against the comparator, for all patients or one subgroup (``specs`` from ``chart_specs``)."""
+    subgroups = tuple(specs)
+    subgroup = subgroups[0]
+    if len(subgroups) > 1:
+        subgroup = st.segmented_control("Patients", subgroups, default=subgroup, key=key) or subgroup
+    spec = specs[subgroup]
+    st.vega_lite_chart(spec, width="stretch")
+    if subgroup != subgroups[0]:
+        reactions = ", ".join(dict.fromkeys(row["reaction"] for row in spec["data"]["values"]))
+        st.caption(f"Reported separately for {subgroup}: {reactions}.")
+    return subgroup
@@ -0,0 +1,114 @@
+"""
+Content hashes per monograph section, for incremental rebuilds and change manifests.
+
+    python -m pharmacode.versioning [--drug entresto] [--previous manifest.json] [-o manifest.json]
+
+``section_hashes`` hashes every data section of the monograph file
+(``drug``, ``strengths``, ``dosing``, ...) and every tab. A tab's hash
+covers its layout and the data sections it renders from
+(``model.SECTION_SOURCES``), so it changes exactly when the tab's output
+can. The app keys its caches on these hashes: after a label update only
+the tabs and tables whose source changed are rebuilt.
+
+``build_manifest`` records the hashes of a version together with what
+changed since a previous manifest; run it at deploy time and keep the
+output next to the release.
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+
+from pharmacode.model import SECTION_SOURCES, monograph_path
+from pharmacode.styles import STYLESHEET
+
+HASH_LENGTH = 12  # hex digits, as for fingerprinted assets
+DATA_SECTIONS = tuple(sorted({field for fields in SECTION_SOURCES.values() for field in fields}))
+
+
+def content_hash(value):
+    """Hash of a JSON value, independent of key order and formatting."""
+    text = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+def _sections_used(blocks):
+    for block in blocks:
+        if "section" in block:
+            yield block["section"]
+        yield from _sections_used(block.get("blocks", ()))
+        for column in block.get("columns", ()):
+            yield from _sections_used(column)
+
+
+def tab_key(key):
+    return f"tab:{key}"
+
+
+def section_hashes(raw):
+    """``{section: hash}`` for the data sections and tabs (``tab:<key>``) of a decoded monograph."""
+    hashes = {field: content_hash(raw.get(field)) for field in DATA_SECTIONS}
+    for tab in raw["tabs"]:
+        sources = sorted({field for name in _sections_used(tab["blocks"]) for field in SECTION_SOURCES[name]})
+        hashes[tab_key(tab["key"])] = content_hash([tab, {field: hashes[field] for field in sources}])
+    return hashes
+
+
+def load_section_hashes(path):
+    with open(path, encoding="utf-8") as f:
+        return section_hashes(json.load(f))
+
+
+def combined_hash(hashes, *sections):
+    """One hash for a set of sections, e.g. a table built from ``dosing`` and ``strengths``."""
+    return content_hash([hashes[section] for section in sections])
+
+
+def diff_hashes(old, new):
+    return {
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+        "changed": sorted(key for key in new.keys() & old.keys() if new[key] != old[key]),
+    }
+
+
+def build_manifest(path, previous=None):
+    """Hashes of the monograph at ``path`` (and the app stylesheet), with changes since ``previous``."""
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    hashes = section_hashes(raw)
+    with open(STYLESHEET, encoding="utf-8") as f:
+        hashes["stylesheet"] = content_hash(f.read())
+    manifest = {"version": raw["version"], "sections": hashes}
+    if previous is not None:
+        manifest["previous_version"] = previous["version"]
+        manifest.update(diff_hashes(previous["sections"], hashes))
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a monograph's section hash manifest.")
+    parser.add_argument("--drug", default="entresto", help="monograph key (pharmacode/monographs/<key>.json)")
+    parser.add_argument("--previous", help="manifest of the deployed version, to record what changed")
+    parser.add_argument("-o", "--output", help="write the manifest here; default: stdout")
+    args = parser.parse_args(argv)
+
+    previous = None
+    if args.previous:
+        with open(args.previous, encoding="utf-8") as f:
+            previous = json.load(f)
+    manifest = build_manifest(monograph_path(args.drug), previous)
+    text = json.dumps(manifest, indent=1, ensure_ascii=False) + "\n"
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    if previous is not None:
+        changes = sum(len(manifest[kind]) for kind in ("added", "removed", "changed"))
+        print(f"{manifest['previous_version']} -> {manifest['version']}: {changes} sections changed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pharmacode.model import load_monograph, monograph_path  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def monograph():
+    return load_monograph(monograph_path("entresto"))
@@ -0,0 +1,55 @@
+import math
+
+import pytest
+
+from pharmacode.dosing import build_dose_table, pediatric_doses, pediatric_schedule
+
+
+@pytest.fixture(scope="module")
+def table(monograph):
+    return build_dose_table(monograph)
+
+
+def _mg(table, weight):
+    return [step.mg for step in pediatric_schedule(table, weight)]
+
+
+def test_per_kg_band_below_40_kg(table):
+    assert _mg(table, 20) == pytest.approx([32.0, 46.0, 62.0])  # 1.6, 2.3, 3.1 mg/kg
+    assert _mg(table, 39.9) == pytest.approx([63.84, 91.77, 123.69])
+
+
+@pytest.mark.parametrize("weight", [40, 45, 49.9])
+def test_40_to_50_kg_titrates_to_72_78(table, weight):
+    assert _mg(table, weight) == [50.0, 100.0, 150.0]  # 24/26 -> 49/51 -> 72/78
+
+
+@pytest.mark.parametrize("weight", [50, 80])
+def test_50_kg_and_over_titrates_to_97_103(table, weight):
+    assert _mg(table, weight) == [100.0, 150.0, 200.0]  # 49/51 -> 72/78 -> 97/103
+
+
+def test_72_78_step_is_three_24_26_tablets(table):
+    for weight, step in ((45, 2), (60, 1)):
+        assert pediatric_schedule(table, weight)[step].tablets == (("24/26", 3),)
+    assert pediatric_schedule(table, 45)[1].tablets == (("49/51", 1),)
+
+
+def test_titration_weeks_and_suspension(table):
+    schedule = pediatric_schedule(table, 20)
+    assert [step.week for step in schedule] == [0, 2, 4]
+    assert [step.suspension_ml for step in schedule] == [8.0, 11.5, 15.5]  # 4 mg/mL, 0.1 mL syringe
+
+
+@pytest.mark.parametrize("weight", [0, -5, math.nan])
+def test_weights_outside_every_band_have_no_schedule(table, weight):
+    assert pediatric_schedule(table, weight) == ()
+
+
+def test_roster_matches_single_schedules(table):
+    weights = [20, 40, 50, 0, math.nan]
+    doses = pediatric_doses(table, weights)
+    assert list(doses["band"][3:]) == [-1, -1]
+    assert (doses["tablet"][3:] == -1).all()
+    for row, weight in enumerate(weights[:3]):
+        assert [mg for mg in doses["mg"][row] if not math.isnan(mg)] == pytest.approx(_mg(table, weight))
@@ -0,0 +1,38 @@
+import pytest
+
+from pharmacode.interactions import build_interaction_index
+
+
+@pytest.fixture(scope="module")
+def index(monograph):
+    return build_interaction_index(monograph)
+
+
+def _matches(index, medication):
+    return [(finding.drug, finding.interaction.name) for finding in index.check([medication]).findings]
+
+
+@pytest.mark.parametrize("medication, drug", [
+    ("KCl 20 mEq", "KCl"),
+    ("K-Cl 10 mEq ER", "K-Cl"),
+    ("potassium", "potassium"),
+    ("Potassium 99 mg daily", "potassium"),
+    ("potassium chloride ER", "potassium chloride"),
+    ("Klor-Con M20", "potassium chloride"),
+    ("potassium gluconate 595 mg", "potassium gluconate"),
+])
+def test_potassium_supplement_spellings(index, medication, drug):
+    assert _matches(index, medication) == [(drug, "Potassium Supplements / Salt Substitutes")]
+
+
+@pytest.mark.parametrize("medication", ["spironolactone 25 mg", "potassium-sparing diuretic"])
+def test_potassium_sparing_diuretics_keep_their_entry(index, medication):
+    assert [name for _, name in _matches(index, medication)] == [
+        "Potassium-Sparing Diuretics (Spironolactone, Eplerenone)"
+    ]
+
+
+def test_unknown_entry_is_unmatched(index):
+    report = index.check(["vitamin K", "KCl"])
+    assert report.unmatched == ("vitamin K",)
+    assert report.severity == "monitor"
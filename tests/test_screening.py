@@ -0,0 +1,100 @@
+from dataclasses import replace
+
+import pandas as pd
+import pytest
+
+from pharmacode.model import Condition
+from pharmacode.screening import Check, compile_screen, normalize_patients, screen
+
+COMPLETE = {
+    "age_years": 60,
+    "weight_kg": 70,
+    "egfr": 80,
+    "child_pugh": "none",
+    "pregnant": "no",
+    "diabetes": "no",
+    "prior_angioedema_acei_arb": "no",
+    "hypersensitivity": "no",
+    "on_aliskiren": "no",
+    "on_acei": "no",
+}
+
+
+@pytest.fixture(scope="module")
+def rules(monograph):
+    return compile_screen(monograph)
+
+
+def _screen(rules, *rows):
+    return screen(rules, normalize_patients(pd.DataFrame([{**COMPLETE, **row} for row in rows])))
+
+
+def test_complete_record_gets_the_standard_start(rules):
+    result = _screen(rules, {}).iloc[0]
+    assert (result["status"], result["start_dose"], result["start_mg"], result["flags"]) == ("ok", "49/51 mg BID", 100, "")
+
+
+def test_contraindicated_rows(rules):
+    result = _screen(
+        rules,
+        {"pregnant": "yes"},
+        {"on_acei": "yes", "acei_hours_since_last_dose": 12},
+        {"on_aliskiren": "yes", "diabetes": "yes"},
+    )
+    assert list(result["status"]) == ["contraindicated"] * 3
+    assert list(result["start_dose"]) == [""] * 3
+    assert result["flag_pregnancy"].tolist() == [True, False, False]
+
+
+def test_washout_completed_is_ok(rules):
+    result = _screen(rules, {"on_acei": "yes", "acei_hours_since_last_dose": 48}).iloc[0]
+    assert (result["status"], result["start_dose"]) == ("ok", "49/51 mg BID")
+
+
+@pytest.mark.parametrize("row", [{"egfr": 20}, {"child_pugh": "B"}])
+def test_renal_and_moderate_hepatic_impairment_start_at_24_26(rules, row):
+    result = _screen(rules, row).iloc[0]
+    assert (result["status"], result["start_dose"], result["start_mg"]) == ("ok", "24/26 mg BID", 50)
+
+
+def test_severe_hepatic_impairment_is_avoid(rules):
+    result = _screen(rules, {"child_pugh": "C"}).iloc[0]
+    assert result["status"] == "avoid"
+    assert result["start_dose"] == "" and pd.isna(result["start_mg"])
+
+
+def test_blank_fields_make_an_incomplete_record(rules):
+    blank = {field: None for field in COMPLETE if field not in ("age_years", "weight_kg")}
+    result = _screen(rules, blank, {"on_acei": "yes"}).reset_index(drop=True)
+    assert list(result["status"]) == ["caution", "caution"]
+    assert list(result["start_dose"]) == ["", ""]
+    assert "Incomplete record: no pregnant" in result["flags"][0]
+    assert result["flags"][1] == "Incomplete record: no acei_hours_since_last_dose"
+
+
+def test_pediatric_rows(rules):
+    result = _screen(
+        rules,
+        {"age_years": 10, "weight_kg": 20},
+        {"age_years": 14, "weight_kg": 45},
+        {"age_years": 0.5, "weight_kg": 8},
+        {"age_years": 10, "weight_kg": None},
+        {"age_years": 10, "weight_kg": 20, "egfr": 20},
+    ).reset_index(drop=True)
+    assert list(result["start_dose"]) == ["32 mg BID", "50 mg BID", "", "", ""]
+    assert list(result["status"]) == ["ok", "ok", "caution", "caution", "caution"]
+    assert "below age 1" in result["flags"][2]
+    assert "needs a weight" in result["flags"][3]
+    assert "adjustment not covered" in result["flags"][4]
+
+
+def test_more_than_63_rules(rules):
+    extra = tuple(
+        Check(f"egfr_below_{i}", f"eGFR below {i}", None, (Condition("egfr", "<", float(i)),)) for i in range(1, 81)
+    )
+    many = replace(rules, checks=rules.checks + extra)
+    result = _screen(many, {"egfr": 75.5}, {"egfr": 0.5}).reset_index(drop=True)
+    assert result["flags"][0].split("; ")[-5:] == [f"eGFR below {i}" for i in range(76, 81)]
+    assert result["flags"][1].count("eGFR below") == 80
+    assert result["flag_egfr_below_80"].tolist() == [True, True]
+    assert result["flag_egfr_below_75"].tolist() == [False, True]